@@ -0,0 +1,254 @@
+"""
+Benchmarks for ray casting, level loading and the per-frame level update.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--output results.json] [--max-segments N]
+                                        [--with-sprites]
+
+Runs headless by default. Benchmarks that need sprites (mirror rotation) are only
+run with --with-sprites, which opens an invisible arcade window. Results are
+written as JSON so runs on different commits can be compared.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+REPO_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYNTHETIC_SEGMENT_COUNTS = (10, 100, 1000, 10000)
+NUM_ENEMIES = 50
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--output", help="JSON file to write, defaults to stdout")
+    parser.add_argument("--max-segments", type=int, default=10000)
+    parser.add_argument(
+        "--max-reference-segments",
+        type=int,
+        default=1000,
+        help="skip the pure Python reference ray cast on larger scenes",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--with-sprites", action="store_true")
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+if not ARGS.with_sprites:
+    os.environ["ILLUMIGATOR_HEADLESS"] = "1"
+sys.path.insert(0, REPO_PATH)
+
+import numpy  # noqa: E402
+
+from illumigator import entity, level, level_generator, util  # noqa: E402
+
+
+# ========================= Scenes =========================
+def synthetic_level_data(segment_count: int, seed: int = 0) -> dict:
+    # Walls, mirrors and lenses contribute 4, 4 and 2 segments each, the outer walls
+    # alone contribute 16
+    object_count = max(0, (segment_count - 16) // 4)
+    num_mirror_pairs = min(object_count // 20, 4)
+    num_mirrors = object_count // 5
+    return level_generator.generate_level(
+        seed,
+        num_walls=object_count - num_mirrors - 2 * num_mirror_pairs,
+        num_mirrors=num_mirrors,
+        num_mirror_pairs=num_mirror_pairs,
+        num_lenses=min(object_count // 50, 4),
+        num_sources=2,
+        num_animated_walls=0,
+        name="Synthetic %d" % segment_count,
+    )
+
+
+def get_scenes() -> list:
+    scenes = [("level_1", util.load_data("1.json", True), ("1.json", True, True))]
+    community_levels = util.load_data("levels/community/levels.json")["levels"]
+    for filename in sorted(community_levels):
+        scenes.append(
+            (
+                "community/" + filename,
+                util.load_data(filename, True, False),
+                (filename, True, False),
+            )
+        )
+    for segment_count in SYNTHETIC_SEGMENT_COUNTS:
+        if segment_count <= ARGS.max_segments:
+            scenes.append(
+                (
+                    "synthetic_%d" % segment_count,
+                    synthetic_level_data(segment_count),
+                    None,
+                )
+            )
+    return scenes
+
+
+# ========================= Timing =========================
+def measure(function) -> dict:
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=ARGS.repeat, number=number)]
+    return {
+        "calls": number * ARGS.repeat,
+        "seconds_per_call_min": min(times),
+        "seconds_per_call_median": statistics.median(times),
+    }
+
+
+class CharacterProxy:
+    # Stands in for entity.Character, which also loads textures and sounds
+    def __init__(self, center_x, center_y):
+        import arcade
+
+        self.character_sprite = arcade.SpriteSolidColor(48, 48, arcade.color.WHITE)
+        self.character_sprite.center_x = center_x
+        self.character_sprite.center_y = center_y
+
+
+def benchmark_scene(name: str, level_data: dict, data_args) -> list:
+    results = []
+    lvl = level.load_level(level_data)
+
+    def record(benchmark, function):
+        result = {"benchmark": benchmark, "scene": name}
+        result["segments"] = lvl.intersection_engine.segment_count
+        result.update(measure(function))
+        results.append(result)
+        print(
+            "%-28s %-30s %8.3f ms"
+            % (benchmark, name, 1000 * result["seconds_per_call_median"]),
+            file=sys.stderr,
+        )
+
+    if data_args is not None:
+        record("util.load_data", lambda: util.load_data(*data_args))
+    record("level.load_level", lambda: level.load_level(level_data))
+
+    world_objects = (
+        lvl.wall_list
+        + lvl.mirror_list
+        + lvl.light_receiver_list
+        + lvl.light_sources_list
+    )
+    light_rays = [
+        ray
+        for light_source in lvl.light_sources_list
+        for ray in light_source._light_rays
+    ]
+    character = None
+    if ARGS.with_sprites:
+        character = CharacterProxy(util.WORLD_WIDTH // 2, util.WORLD_HEIGHT // 2)
+
+    def cast_reference():
+        for ray in light_rays:
+            ray.cast_ray(world_objects)
+
+    def cast_sources():
+        for light_source in lvl.light_sources_list:
+            light_source.cast_rays(world_objects, lvl.intersection_engine)
+
+    def update_idle():
+        lvl.update(character, 0, 0)
+
+    def update_full_trace():
+        for light_source in lvl.light_sources_list:
+            light_source._needs_full_trace = True
+        lvl.update(character, 0, 0)
+
+    if lvl.intersection_engine.segment_count <= ARGS.max_reference_segments:
+        record("LightRay.cast_ray", cast_reference)
+    record("LightSource.cast_rays", cast_sources)
+    record("Level.update (idle)", update_idle)
+    record("Level.update (full trace)", update_full_trace)
+    record("Level.reset", lvl.reset)
+
+    # A character sized box swept across the middle of the level
+    character_box = numpy.array(
+        [util.WORLD_WIDTH / 2, util.WORLD_HEIGHT / 2] * 2
+    ) + numpy.array([-24, -24, 24, 24])
+    displacement = numpy.array([util.PLAYER_MOVEMENT_SPEED, 0])
+    record(
+        "Level.check_box_collision",
+        lambda: lvl.check_box_collision(character_box, displacement),
+    )
+
+    def compute_flow_field():
+        lvl.navigation_grid._target_cell = None
+        lvl.navigation_grid.set_target(character_box[:2])
+
+    record("NavigationGrid.set_target", compute_flow_field)
+
+    # A horde chasing a player in the middle of the level, all awake
+    enemies = entity.EnemyManager(
+        numpy.random.default_rng(0).uniform(
+            [0, 0], [util.WORLD_WIDTH, util.WORLD_HEIGHT], (NUM_ENEMIES, 2)
+        )
+    )
+    enemies.states[:] = entity.EnemyManager.AGGRO
+    record(
+        "EnemyManager.update_positions",
+        lambda: enemies.update_positions(lvl, character_box[:2] + 24),
+    )
+
+    if character is not None:
+        record("Level.check_collisions", lambda: lvl.check_collisions(character))
+        if len(lvl.mirror_list) > 0:
+            mirror = lvl.mirror_list[0]
+            record(
+                "WorldObject.move_if_safe",
+                lambda: mirror.move_if_safe(
+                    character, numpy.zeros(2), util.OBJECT_ROTATION_AMOUNT
+                ),
+            )
+    return results
+
+
+def get_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_PATH, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    if ARGS.with_sprites:
+        import arcade
+
+        arcade.Window(util.WORLD_WIDTH, util.WORLD_HEIGHT, visible=False)
+
+    # util.load_data prints every path it opens, keep stdout for the report
+    with contextlib.redirect_stdout(sys.stderr):
+        results = []
+        for name, level_data, data_args in get_scenes():
+            results.extend(benchmark_scene(name, level_data, data_args))
+
+    report = {
+        "commit": get_commit(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "headless": util.HEADLESS,
+        "ray_broadphase": util.RAY_BROADPHASE,
+        "assets": util.ASSETS.get_stats(),
+        "results": results,
+    }
+    if ARGS.output:
+        with open(ARGS.output, "w") as outfile:
+            json.dump(report, outfile, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
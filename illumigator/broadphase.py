@@ -0,0 +1,214 @@
+import math
+import numpy
+
+from illumigator import util
+
+
+class UniformGrid:
+    """
+    Spatial hash over the world that maps each grid cell to the indices of the
+    engine segments whose bounding boxes overlap it. Rays are queried in batches
+    that advance as a wavefront, one cell per ray at a time, and each ray stops at
+    the first cell containing a confirmed hit.
+
+    Static segments are hashed once into packed arrays, dynamic segments into
+    per-cell sets that are updated as their world objects move and packed again
+    only when a query finds them changed.
+    """
+
+    def __init__(
+        self,
+        engine,
+        cell_size: float = util.GRID_CELL_SIZE,
+        static_cells: tuple = None,
+    ):
+        self._engine = engine
+        self._cell_size = cell_size
+        self._num_columns = math.ceil(util.WORLD_WIDTH / cell_size)
+        self._num_rows = math.ceil(util.WORLD_HEIGHT / cell_size)
+        num_cells = self._num_columns * self._num_rows
+
+        # static_cells is the (offsets, indices) pair of an earlier grid over the
+        # same static geometry, see get_static_cells
+        if static_cells is None:
+            cell_indices = [[] for _ in range(num_cells)]
+            for index in range(engine.static_segment_count):
+                for cell in self._get_covered_cells(
+                    engine.get_segment(index).get_bounding_box()
+                ):
+                    cell_indices[cell].append(index)
+            static_cells = self._pack_cells(cell_indices)
+        self._static_offsets, self._static_indices = static_cells
+
+        self._dynamic_cells = [set() for _ in range(num_cells)]
+        self._packed_dynamic_cells = None  # Packed on demand, None when stale
+        self._segment_cells = {}
+        for index in range(engine.static_segment_count, engine.segment_count):
+            self._segment_cells[index] = set()
+            self._update_segment(index)
+
+    @staticmethod
+    def _pack_cells(cell_indices: list) -> tuple:
+        # (offsets, indices) with cell i holding indices[offsets[i]:offsets[i + 1]]
+        offsets = numpy.cumsum([0] + [len(cell) for cell in cell_indices])
+        indices = numpy.array(
+            [index for cell in cell_indices for index in sorted(cell)], dtype=int
+        )
+        return offsets, indices
+
+    def get_static_cells(self) -> tuple:
+        return self._static_offsets, self._static_indices
+
+    def update_world_object(self, world_object):
+        for index in self._engine.get_world_object_segment_indices(world_object):
+            self._update_segment(index)
+
+    def _update_segment(self, index: int):
+        # Only touches the cells the segment leaves and enters
+        new_cells = self._get_covered_cells(
+            self._engine.get_segment(index).get_bounding_box()
+        )
+        old_cells = self._segment_cells[index]
+        for cell in old_cells - new_cells:
+            self._dynamic_cells[cell].discard(index)
+        for cell in new_cells - old_cells:
+            self._dynamic_cells[cell].add(index)
+        self._segment_cells[index] = new_cells
+        if new_cells != old_cells:
+            self._packed_dynamic_cells = None
+
+    def _get_covered_cells(self, bounding_box: numpy.ndarray) -> set:
+        # Geometry outside the world is clamped into the border cells
+        min_column, max_column = (
+            min(max(int(x // self._cell_size), 0), self._num_columns - 1)
+            for x in (bounding_box[0], bounding_box[2])
+        )
+        min_row, max_row = (
+            min(max(int(y // self._cell_size), 0), self._num_rows - 1)
+            for y in (bounding_box[1], bounding_box[3])
+        )
+        return {
+            row * self._num_columns + column
+            for row in range(min_row, max_row + 1)
+            for column in range(min_column, max_column + 1)
+        }
+
+    def get_nearest_intersections(
+        self, origins: numpy.ndarray, directions: numpy.ndarray
+    ) -> tuple:
+        """
+        Returns (segment indices, distances along directions) of the nearest hits
+        of (R, 2) rays, with -1 and inf for rays that hit nothing inside the grid.
+        Each step gathers the candidates of the next cell of every ray still
+        searching and tests them in one call, and rays drop out at the first cell
+        containing a confirmed hit.
+        """
+        nearest_indices = numpy.full(len(origins), -1, dtype=int)
+        nearest_distances = numpy.full(len(origins), numpy.inf)
+        ray_rows, cells, steps, t_exits = self._get_crossed_cells(origins, directions)
+        if self._packed_dynamic_cells is None:
+            self._packed_dynamic_cells = self._pack_cells(self._dynamic_cells)
+
+        is_searching = numpy.ones(len(origins), dtype=bool)
+        for step in range(numpy.max(steps, initial=-1) + 1):
+            pieces = numpy.flatnonzero((steps == step) & is_searching[ray_rows])
+            if len(pieces) == 0:
+                break
+            pair_rays, pair_segments = [], []
+            for offsets, indices in (
+                (self._static_offsets, self._static_indices),
+                self._packed_dynamic_cells,
+            ):
+                counts = offsets[cells[pieces] + 1] - offsets[cells[pieces]]
+                # Position of every candidate in indices, cell by cell
+                positions = numpy.arange(numpy.sum(counts)) + numpy.repeat(
+                    offsets[cells[pieces]] - (numpy.cumsum(counts) - counts), counts
+                )
+                pair_rays.append(numpy.repeat(ray_rows[pieces], counts))
+                pair_segments.append(indices[positions])
+            pair_rays = numpy.concatenate(pair_rays)
+            pair_segments = numpy.concatenate(pair_segments)
+
+            if len(pair_rays) > 0:
+                distances = self._engine.get_pair_intersection_distances(
+                    origins[pair_rays], directions[pair_rays], pair_segments
+                )
+                # Nearest pair of each ray: sorted by ray then distance, the first
+                order = numpy.lexsort((distances, pair_rays))
+                _, first = numpy.unique(pair_rays[order], return_index=True)
+                nearest = order[first]
+                nearest = nearest[
+                    distances[nearest] < nearest_distances[pair_rays[nearest]]
+                ]
+                nearest_indices[pair_rays[nearest]] = pair_segments[nearest]
+                nearest_distances[pair_rays[nearest]] = distances[nearest]
+
+            # Every cell containing a closer point has been visited already
+            is_searching[
+                ray_rows[pieces][nearest_distances[ray_rows[pieces]] <= t_exits[pieces]]
+            ] = False
+        return nearest_indices, nearest_distances
+
+    def _get_crossed_cells(
+        self, origins: numpy.ndarray, directions: numpy.ndarray
+    ) -> tuple:
+        """
+        Returns (ray rows, cell indices, steps, exit distances) arrays with an entry
+        for every grid cell each ray crosses, where step counts the cells the ray
+        crossed before. A ray's path through the grid is split at every grid line
+        it crosses, the middle of each piece lies in one crossed cell.
+        """
+        world_size = numpy.array([util.WORLD_WIDTH, util.WORLD_HEIGHT])
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            # Clip against the grid bounds (slab test)
+            t1 = -origins / directions
+            t2 = (world_size - origins) / directions
+            is_inside = (origins >= 0) & (origins <= world_size)
+            t_low = numpy.where(
+                directions == 0,
+                numpy.where(is_inside, -numpy.inf, numpy.inf),
+                numpy.minimum(t1, t2),
+            )
+            t_high = numpy.where(
+                directions == 0,
+                numpy.where(is_inside, numpy.inf, -numpy.inf),
+                numpy.maximum(t1, t2),
+            )
+            t_enter = numpy.maximum(numpy.max(t_low, axis=1), 0)
+            t_exit = numpy.min(t_high, axis=1)
+
+            # Distances to every vertical and horizontal grid line
+            t_columns = (
+                numpy.arange(self._num_columns + 1) * self._cell_size
+                - origins[:, 0, None]
+            ) / directions[:, 0, None]
+            t_rows = (
+                numpy.arange(self._num_rows + 1) * self._cell_size
+                - origins[:, 1, None]
+            ) / directions[:, 1, None]
+        t_splits = numpy.concatenate(
+            (t_enter[:, None], t_exit[:, None], t_columns, t_rows), axis=1
+        )
+        t_splits = numpy.where(
+            (t_splits >= t_enter[:, None]) & (t_splits <= t_exit[:, None]),
+            t_splits,
+            t_exit[:, None],
+        )
+        t_splits.sort(axis=1)
+
+        # Pieces of zero length (corners, rays missing the grid) cross no cell
+        is_piece = (t_splits[:, 1:] > t_splits[:, :-1]) & numpy.isfinite(
+            t_exit[:, None]
+        )
+        ray_rows, piece_columns = numpy.nonzero(is_piece)
+        steps = (numpy.cumsum(is_piece, axis=1) - 1)[ray_rows, piece_columns]
+        t_exits = t_splits[ray_rows, piece_columns + 1]
+        t_middles = 0.5 * (t_splits[ray_rows, piece_columns] + t_exits)
+        points = origins[ray_rows] + directions[ray_rows] * t_middles[:, None]
+        columns = numpy.clip(
+            (points[:, 0] // self._cell_size).astype(int), 0, self._num_columns - 1
+        )
+        rows = numpy.clip(
+            (points[:, 1] // self._cell_size).astype(int), 0, self._num_rows - 1
+        )
+        return ray_rows, rows * self._num_columns + columns, steps, t_exits
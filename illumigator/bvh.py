@@ -0,0 +1,200 @@
+import numpy
+
+from illumigator import util
+
+
+class BoundingVolumeHierarchy:
+    """
+    Pair of bounding volume trees over the engine segments (Line, Circle and Arc
+    alike): a prebuilt tree for static geometry that is never touched again, and
+    a tree for dynamic geometry that is refit in place as world objects move.
+    """
+
+    def __init__(self, engine, leaf_size: int = util.BVH_LEAF_SIZE):
+        self._static_tree = BoundingVolumeTree(
+            engine, numpy.arange(engine.static_segment_count), leaf_size
+        )
+        self._dynamic_tree = BoundingVolumeTree(
+            engine,
+            numpy.arange(engine.static_segment_count, engine.segment_count),
+            leaf_size,
+        )
+
+    def update_world_object(self, world_object):
+        self._dynamic_tree.update_world_object(world_object)
+
+    def get_nearest_intersection(
+        self, origin: numpy.ndarray, direction: numpy.ndarray
+    ) -> tuple:
+        nearest_index, nearest_distance = self._static_tree.get_nearest_intersection(
+            origin, direction
+        )
+        dynamic_index, dynamic_distance = self._dynamic_tree.get_nearest_intersection(
+            origin, direction, nearest_distance
+        )
+        if dynamic_distance < nearest_distance:
+            return dynamic_index, dynamic_distance
+        return nearest_index, nearest_distance
+
+
+    def get_nearest_intersections(
+        self, origins: numpy.ndarray, directions: numpy.ndarray
+    ) -> tuple:
+        # Trees are traversed ray by ray, nearest children first
+        nearest_indices = numpy.full(len(origins), -1, dtype=int)
+        nearest_distances = numpy.full(len(origins), numpy.inf)
+        for row in range(len(origins)):
+            (
+                nearest_indices[row],
+                nearest_distances[row],
+            ) = self.get_nearest_intersection(origins[row], directions[row])
+        return nearest_indices, nearest_distances
+
+
+class BoundingVolumeTree:
+    """
+    Binary tree of axis-aligned bounding boxes over a subset of the engine
+    segments. When a world object moves, the leaves holding its segments are refit
+    in place and the change is propagated up to the root instead of rebuilding.
+    """
+
+    def __init__(
+        self,
+        engine,
+        segment_indices: numpy.ndarray,
+        leaf_size: int = util.BVH_LEAF_SIZE,
+    ):
+        self._engine = engine
+        self._leaf_size = leaf_size
+        self._segment_bounds = {
+            index: engine.get_segment(index).get_bounding_box()
+            for index in segment_indices
+        }
+
+        # Nodes are stored in flat lists, leaves keep their segment indices
+        self._node_bounds = []
+        self._node_children = []
+        self._node_parent = []
+        self._node_segments = []
+        self._segment_leaf = {}
+        if len(segment_indices) > 0:
+            self._build(segment_indices, -1)
+        self._node_bounds = numpy.array(self._node_bounds).reshape(-1, 4)
+
+    def _build(self, segment_indices: numpy.ndarray, parent: int) -> int:
+        node = len(self._node_children)
+        bounds = numpy.array([self._segment_bounds[index] for index in segment_indices])
+        self._node_bounds.append(
+            numpy.concatenate((bounds[:, :2].min(axis=0), bounds[:, 2:].max(axis=0)))
+        )
+        self._node_parent.append(parent)
+        self._node_children.append(None)
+        self._node_segments.append(None)
+
+        if len(segment_indices) <= self._leaf_size:
+            self._node_segments[node] = segment_indices
+            for index in segment_indices:
+                self._segment_leaf[index] = node
+            return node
+
+        # Median split along the longest axis of the centroids
+        centroids = 0.5 * (bounds[:, :2] + bounds[:, 2:])
+        axis = numpy.argmax(centroids.max(axis=0) - centroids.min(axis=0))
+        order = numpy.argsort(centroids[:, axis], kind="stable")
+        half = len(segment_indices) // 2
+        left = self._build(segment_indices[order[:half]], node)
+        right = self._build(segment_indices[order[half:]], node)
+        self._node_children[node] = (left, right)
+        return node
+
+    def update_world_object(self, world_object):
+        leaves = set()
+        for index in self._engine.get_world_object_segment_indices(world_object):
+            if index not in self._segment_leaf:
+                continue
+            self._segment_bounds[index] = self._engine.get_segment(
+                index
+            ).get_bounding_box()
+            leaves.add(self._segment_leaf[index])
+        for leaf in leaves:
+            self._refit(leaf)
+
+    def _refit(self, node: int):
+        bounds = numpy.array(
+            [self._segment_bounds[index] for index in self._node_segments[node]]
+        )
+        self._node_bounds[node, :2] = bounds[:, :2].min(axis=0)
+        self._node_bounds[node, 2:] = bounds[:, 2:].max(axis=0)
+        node = self._node_parent[node]
+        while node >= 0:
+            left_bounds, right_bounds = self._node_bounds[
+                list(self._node_children[node])
+            ]
+            new_bounds = numpy.concatenate(
+                (
+                    numpy.minimum(left_bounds[:2], right_bounds[:2]),
+                    numpy.maximum(left_bounds[2:], right_bounds[2:]),
+                )
+            )
+            if numpy.array_equal(new_bounds, self._node_bounds[node]):
+                break  # Ancestors already contain the refit child
+            self._node_bounds[node] = new_bounds
+            node = self._node_parent[node]
+
+    def _get_entry_distance(
+        self, node: int, origin: numpy.ndarray, direction: numpy.ndarray
+    ) -> float:
+        # Slab test, returns inf when the ray misses the node's box
+        bounds = self._node_bounds[node]
+        t_enter, t_exit = 0, numpy.inf
+        for axis in (0, 1):
+            if direction[axis] == 0:
+                if not bounds[axis] <= origin[axis] <= bounds[axis + 2]:
+                    return numpy.inf
+                continue
+            t1 = (bounds[axis] - origin[axis]) / direction[axis]
+            t2 = (bounds[axis + 2] - origin[axis]) / direction[axis]
+            t_enter = max(t_enter, min(t1, t2))
+            t_exit = min(t_exit, max(t1, t2))
+        return t_enter if t_enter <= t_exit else numpy.inf
+
+    def get_nearest_intersection(
+        self,
+        origin: numpy.ndarray,
+        direction: numpy.ndarray,
+        max_distance: float = numpy.inf,
+    ) -> tuple:
+        """
+        Returns (segment index, distance along direction) of the nearest hit closer
+        than max_distance, or (-1, max_distance) when there is none.
+        """
+        nearest_index, nearest_distance = -1, max_distance
+        if len(self._node_children) == 0:
+            return nearest_index, nearest_distance
+
+        stack = [(self._get_entry_distance(0, origin, direction), 0)]
+        while stack:
+            entry_distance, node = stack.pop()
+            if entry_distance >= nearest_distance:
+                continue
+
+            if self._node_children[node] is None:
+                candidates = self._node_segments[node]
+                distances = self._engine.get_intersection_distances(
+                    origin[None], direction[None], candidates
+                )[0]
+                column = numpy.argmin(distances)
+                if distances[column] < nearest_distance:
+                    nearest_index = candidates[column]
+                    nearest_distance = distances[column]
+                continue
+
+            # Push the farther child first so the nearer one is visited first
+            children = [
+                (self._get_entry_distance(child, origin, direction), child)
+                for child in self._node_children[node]
+            ]
+            children.sort(reverse=True)
+            stack.extend(child for child in children if child[0] < nearest_distance)
+
+        return nearest_index, nearest_distance
@@ -0,0 +1,196 @@
+import numpy
+
+from illumigator import util
+
+
+class SpatialHash:
+    """
+    Maps square grid cells to the items whose bounding boxes overlap them, so
+    queries only look at items near the queried box. Items are re-hashed when they
+    move, touching only the cells they leave and enter.
+    """
+
+    def __init__(self, cell_size: float = util.COLLISION_CELL_SIZE):
+        self._cell_size = cell_size
+        self._cells = {}
+        self._item_bounds = {}
+        self._item_cells = {}
+
+    def __contains__(self, item) -> bool:
+        return item in self._item_bounds
+
+    def insert(self, item, bounding_box: numpy.ndarray):
+        self._item_cells[item] = set()
+        self.update(item, bounding_box)
+
+    def update(self, item, bounding_box: numpy.ndarray):
+        new_cells = self._get_covered_cells(bounding_box)
+        old_cells = self._item_cells[item]
+        for cell in old_cells - new_cells:
+            self._cells[cell].discard(item)
+            if len(self._cells[cell]) == 0:
+                del self._cells[cell]
+        for cell in new_cells - old_cells:
+            self._cells.setdefault(cell, set()).add(item)
+        self._item_cells[item] = new_cells
+        self._item_bounds[item] = bounding_box
+
+    def get_bounds(self, item) -> numpy.ndarray:
+        return self._item_bounds[item]
+
+    def query(self, bounding_box: numpy.ndarray) -> list:
+        # Returns the items whose bounding boxes overlap bounding_box
+        candidates = set()
+        for cell in self._get_covered_cells(bounding_box):
+            candidates.update(self._cells.get(cell, ()))
+        return [
+            item
+            for item in candidates
+            if self._item_bounds[item][0] <= bounding_box[2]
+            and bounding_box[0] <= self._item_bounds[item][2]
+            and self._item_bounds[item][1] <= bounding_box[3]
+            and bounding_box[1] <= self._item_bounds[item][3]
+        ]
+
+    def _get_covered_cells(self, bounding_box: numpy.ndarray) -> set:
+        min_column, min_row = (int(v // self._cell_size) for v in bounding_box[:2])
+        max_column, max_row = (int(v // self._cell_size) for v in bounding_box[2:])
+        return {
+            (column, row)
+            for column in range(min_column, max_column + 1)
+            for row in range(min_row, max_row + 1)
+        }
+
+
+class OrientedBoxSet:
+    """
+    Oriented bounding boxes of world objects packed into arrays so a moving box
+    can be tested against many of them at once. Rows are refreshed when their
+    world objects move.
+    """
+
+    def __init__(self, world_objects: list):
+        self._rows = {}
+        self._centers = numpy.zeros((len(world_objects), 2))
+        self._axes = numpy.zeros((len(world_objects), 2))
+        self._half_extents = numpy.zeros((len(world_objects), 2))
+        self._bounds = numpy.zeros((len(world_objects), 4))
+        for row, world_object in enumerate(world_objects):
+            self._rows[world_object] = row
+            self.update_world_object(world_object)
+
+    def __contains__(self, world_object) -> bool:
+        return world_object in self._rows
+
+    def update_world_object(self, world_object):
+        row = self._rows[world_object]
+        center, rotation_angle, half_extents = (
+            world_object.get_oriented_bounding_box()
+        )
+        self._centers[row] = center
+        self._axes[row] = [numpy.cos(rotation_angle), numpy.sin(rotation_angle)]
+        self._half_extents[row] = half_extents
+        axis = numpy.abs(self._axes[row])
+        half_size = half_extents[0] * axis + half_extents[1] * axis[::-1]
+        self._bounds[row] = numpy.concatenate((center - half_size, center + half_size))
+
+    def check_box_collision(
+        self,
+        world_objects: list,
+        bounding_box: numpy.ndarray,
+        displacement: numpy.ndarray = numpy.zeros(2),
+    ) -> bool:
+        # True if the box collides with any of world_objects anywhere along its move
+        if len(world_objects) == 0:
+            return False
+        rows = [self._rows[world_object] for world_object in world_objects]
+        return bool(
+            numpy.any(
+                get_swept_box_collisions(
+                    0.5 * (bounding_box[:2] + bounding_box[2:]),
+                    0.5 * (bounding_box[2:] - bounding_box[:2]),
+                    displacement,
+                    self._centers[rows],
+                    self._axes[rows],
+                    self._half_extents[rows],
+                )
+            )
+        )
+
+    def get_box_collisions(
+        self, bounding_boxes: numpy.ndarray, displacements: numpy.ndarray
+    ) -> numpy.ndarray:
+        """
+        Batched check_box_collision for N moving boxes against every oriented box.
+        Pairs are culled with one (N, M) overlap test of the swept and oriented
+        boxes' bounds before the exact test. Returns an (N,) boolean mask.
+        """
+        swept_bounds = numpy.concatenate(
+            (
+                bounding_boxes[:, :2] + numpy.minimum(displacements, 0),
+                bounding_boxes[:, 2:] + numpy.maximum(displacements, 0),
+            ),
+            axis=1,
+        )
+        is_overlapping = numpy.all(
+            (swept_bounds[:, None, :2] <= self._bounds[None, :, 2:])
+            & (self._bounds[None, :, :2] <= swept_bounds[:, None, 2:]),
+            axis=2,
+        )
+        box_indices, rows = numpy.nonzero(is_overlapping)
+        is_colliding = numpy.zeros(len(bounding_boxes), dtype=bool)
+        if len(rows) == 0:
+            return is_colliding
+        pair_boxes = bounding_boxes[box_indices]
+        is_pair_colliding = get_swept_box_collisions(
+            0.5 * (pair_boxes[:, :2] + pair_boxes[:, 2:]),
+            0.5 * (pair_boxes[:, 2:] - pair_boxes[:, :2]),
+            displacements[box_indices],
+            self._centers[rows],
+            self._axes[rows],
+            self._half_extents[rows],
+        )
+        is_colliding[box_indices[is_pair_colliding]] = True
+        return is_colliding
+
+
+def get_swept_box_collisions(
+    box_center: numpy.ndarray,
+    box_half_size: numpy.ndarray,
+    displacement: numpy.ndarray,
+    centers: numpy.ndarray,
+    axes: numpy.ndarray,
+    half_extents: numpy.ndarray,
+) -> numpy.ndarray:
+    """
+    Separating axis test of an axis-aligned box moving by displacement against N
+    oriented boxes, given by their (N,2) centers, unit first axes and half extents.
+    The box is treated as the convex hull of its start and end positions, so fast
+    moves can't tunnel through thin objects. Returns an (N,) boolean mask of the
+    oriented boxes that are touched. The box arguments may also be (N,2) to test
+    N boxes, each against the oriented box in the same row.
+    """
+    perpendicular_axes = numpy.column_stack((-axes[:, 1], axes[:, 0]))
+    # The possible separating axes are the edge normals of both shapes plus the
+    # normal of the direction of travel, none of them need to be unit length
+    separating_axes = numpy.stack(
+        numpy.broadcast_arrays(
+            numpy.array([1.0, 0.0]),
+            numpy.array([0.0, 1.0]),
+            displacement[..., ::-1] * [-1, 1],
+            axes,
+            perpendicular_axes,
+        )
+    )  # (5, N, 2)
+    box_radii = numpy.sum(numpy.abs(separating_axes) * box_half_size, axis=2)
+    oriented_box_radii = half_extents[:, 0] * numpy.abs(
+        numpy.sum(separating_axes * axes, axis=2)
+    ) + half_extents[:, 1] * numpy.abs(
+        numpy.sum(separating_axes * perpendicular_axes, axis=2)
+    )
+    offsets = numpy.sum(separating_axes * (centers - box_center), axis=2)
+    travel = numpy.sum(separating_axes * displacement, axis=2)
+    is_separated = (
+        offsets - oriented_box_radii > numpy.maximum(travel, 0) + box_radii
+    ) | (offsets + oriented_box_radii < numpy.minimum(travel, 0) - box_radii)
+    return ~numpy.any(is_separated, axis=0)
@@ -138,14 +138,12 @@ class Character:
             )  # Normalize and scale with speed
 
             # Checking if x movement is valid
-            self.character_sprite.center_x += direction[0]
-            if level.check_collisions(self):
-                self.character_sprite.center_x -= direction[0]
+            if not level.check_collisions(self, numpy.array([direction[0], 0])):
+                self.character_sprite.center_x += direction[0]
 
             # Checking if y movement is valid
-            self.character_sprite.center_y += direction[1]
-            if level.check_collisions(self):
-                self.character_sprite.center_y -= direction[1]
+            if not level.check_collisions(self, numpy.array([0, direction[1]])):
+                self.character_sprite.center_y += direction[1]
 
             # Check if sound should be played
             if not arcade.Sound.is_playing(self.walking_sound, self.player):
@@ -186,82 +184,166 @@ class Character:
             )
 
 
-class Enemy(Character):
+class EnemyManager:
+    """
+    Every enemy of a level, with positions, states and speeds kept in arrays so
+    waking up, steering, collisions and player contact are computed for all of
+    them in a few vectorized passes. Enemies that are asleep or far from the
+    player only update every util.ENEMY_LOD_INTERVAL frames, moving that many
+    steps at once.
+    """
+
+    ASLEEP = 0
+    AGGRO = 1
+
     def __init__(
         self,
+        positions: numpy.ndarray,
+        speed: float = ENEMY_MOVEMENT_SPEED,
         scale_factor=2,
         image_width=24,
         image_height=24,
-        # TODO: Should be placed in different places based on level
-        center_x=WORLD_WIDTH - 200,
-        center_y=WORLD_HEIGHT - 200,
     ):
-        super().__init__(scale_factor, image_width, image_height, center_x, center_y)
-        self.state = "asleep"
+        self._start_positions = numpy.array(positions, dtype=float).reshape(-1, 2)
+        self.positions = self._start_positions.copy()
+        self.states = numpy.full(len(self.positions), self.ASLEEP)
+        self.speeds = numpy.full(len(self.positions), float(speed))
+        self._frame = 0
+
+        # All enemies share one texture and are drawn from one sprite list
+        self._sprite_list = [] if util.HEADLESS else arcade.SpriteList()
+        self._half_size = 0.5 * scale_factor * numpy.array([image_width, image_height])
+        if not util.HEADLESS:
+            sprite_file = util.PLAYER_SPRITE.format(i=0, direction="right")
+            for position in self.positions:
+                self._sprite_list.append(
+                    util.load_sprite(
+                        sprite_file,
+                        scale_factor,
+                        image_width=image_width,
+                        image_height=image_height,
+                        center_x=position[0],
+                        center_y=position[1],
+                        hit_box_algorithm="Simple",
+                    )
+                )
+            if len(self._sprite_list) > 0:
+                sprite = self._sprite_list[0]
+                self._half_size = 0.5 * numpy.array(
+                    [sprite.right - sprite.left, sprite.top - sprite.bottom]
+                )
+
+    def __len__(self):
+        return len(self.positions)
 
-        self.left_character_loader = SpriteLoader("left")
-        self.right_character_loader = SpriteLoader("right")
-
-        self.character_sprite = util.load_sprite(
-            self.right_character_loader.sprite_files[0],
-            scale_factor,
-            image_width=image_width,
-            image_height=image_height,
-            center_x=center_x,
-            center_y=center_y,
-            hit_box_algorithm="Simple",
-        )
+    def draw(self):
+        self._sprite_list.draw(pixelated=True)
 
-    def update(self, level, player):
-        dist = numpy.sqrt(
-            (self.character_sprite.center_x - player.character_sprite.center_x) ** 2
-            + (self.character_sprite.center_y - player.character_sprite.center_y) ** 2
+    def reset(self):
+        self.positions = self._start_positions.copy()
+        self.states[:] = self.ASLEEP
+        self._frame = 0
+        self._update_sprites()
+
+    def _update_sprites(self):
+        for sprite, position in zip(self._sprite_list, self.positions):
+            sprite.center_x, sprite.center_y = position[0], position[1]
+
+    def update(self, level, player: Character):
+        player_sprite = player.character_sprite
+        self.update_positions(
+            level,
+            numpy.array([player_sprite.center_x, player_sprite.center_y]),
         )
-
-        if self.state == "asleep" and dist < 300:
-            self.state = "aggro"
-
-        if self.state == "aggro":
-            direction = numpy.array(
+        self._update_sprites()
+        if self.check_player_contact(
+            numpy.array(
                 [
-                    player.character_sprite.center_x - self.character_sprite.center_x,
-                    player.character_sprite.center_y - self.character_sprite.center_y,
+                    player_sprite.left,
+                    player_sprite.bottom,
+                    player_sprite.right,
+                    player_sprite.top,
                 ]
             )
+        ):
+            player.kill()
 
-            direction_mag = numpy.linalg.norm(direction)
-            if direction_mag > 0:
-                direction = (
-                    direction * ENEMY_MOVEMENT_SPEED / direction_mag
-                )  # Normalize and scale with speed
-
-                prev_x = self.character_sprite.center_x
-                prev_y = self.character_sprite.center_y
-
-                self.character_sprite.center_x += direction[0]
-                self.character_sprite.center_y += direction[1]
-
-                if level.check_collisions(self):
-                    self.character_sprite.center_x = prev_x
-                    self.character_sprite.center_y = prev_y
+    def update_positions(self, level, player_position: numpy.ndarray):
+        if len(self.positions) == 0:
+            return
+        self._frame += 1
+        distances = numpy.linalg.norm(self.positions - player_position, axis=1)
 
-                    perp_direction = numpy.array([-direction[1], direction[0]])
-                    self.character_sprite.center_x += perp_direction[0]
-                    self.character_sprite.center_y += perp_direction[1]
+        # Far or sleeping enemies take turns updating, staggered by index
+        is_low_detail = (self.states == self.ASLEEP) | (
+            distances > util.ENEMY_LOD_DISTANCE
+        )
+        is_due = (self._frame + numpy.arange(len(self.positions))) % (
+            util.ENEMY_LOD_INTERVAL
+        ) == 0
+        is_updating = ~is_low_detail | is_due
+        self.states[is_updating & (distances < util.ENEMY_WAKE_DISTANCE)] = self.AGGRO
+        moving = numpy.flatnonzero(is_updating & (self.states == self.AGGRO))
+        if len(moving) == 0:
+            return
 
-                    if level.check_collisions(self):
-                        self.character_sprite.center_x -= 2 * perp_direction[0]
-                        self.character_sprite.center_y -= 2 * perp_direction[1]
+        # Follow the level's flow field towards the player, head straight at them
+        # once in the same cell or if they can't be reached
+        positions = self.positions[moving]
+        level.navigation_grid.set_target(player_position)
+        directions = level.navigation_grid.get_directions(positions)
+        is_direct = ~numpy.any(directions, axis=1)
+        directions[is_direct] = player_position - positions[is_direct]
+        direction_mags = numpy.linalg.norm(directions, axis=1)
+        has_direction = direction_mags > 0
+        moving, positions = moving[has_direction], positions[has_direction]
+        directions = directions[has_direction] / direction_mags[has_direction, None]
+        step_sizes = self.speeds[moving] * numpy.where(
+            is_low_detail[moving], util.ENEMY_LOD_INTERVAL, 1
+        )
+        steps = directions * step_sizes[:, None]
 
-                if arcade.check_for_collision(
-                    self.character_sprite, player.character_sprite
-                ):
-                    player.kill()
+        # Usually blocked when cutting a corner, re-center in the current cell
+        # first, otherwise sidestep to one side or the other
+        bounding_boxes = numpy.concatenate(
+            (positions - self._half_size, positions + self._half_size), axis=1
+        )
+        is_blocked = level.check_box_collisions(bounding_boxes, steps)
+        if numpy.any(is_blocked):
+            recenter = (
+                level.navigation_grid.get_cell_centers(positions[is_blocked])
+                - positions[is_blocked]
+            )
+            recenter_mags = numpy.linalg.norm(recenter, axis=1)
+            is_far = recenter_mags > step_sizes[is_blocked]
+            recenter[is_far] *= (
+                step_sizes[is_blocked][is_far] / recenter_mags[is_far]
+            )[:, None]
+            blocked = numpy.flatnonzero(is_blocked)
+            can_recenter = (recenter_mags > 0) & ~level.check_box_collisions(
+                bounding_boxes[blocked], recenter
+            )
+            steps[blocked[can_recenter]] = recenter[can_recenter]
 
-    def reset_pos(self, c_x, c_y):
-        self.character_sprite.center_x = c_x
-        self.character_sprite.center_y = c_y
-        # Makes sure character is facing right upon reset.
-        self.right_character_loader.reset()
-        self.state = "asleep"
-        self.character_sprite.texture = next(self.right_character_loader)
+            sidestepping = blocked[~can_recenter]
+            steps[sidestepping] = steps[sidestepping, ::-1] * [-1, 1]
+            is_sidestep_blocked = level.check_box_collisions(
+                bounding_boxes[sidestepping], steps[sidestepping]
+            )
+            steps[sidestepping[is_sidestep_blocked]] *= -1
+
+        self.positions[moving] += steps
+
+    def check_player_contact(self, player_bounding_box: numpy.ndarray) -> bool:
+        # Whether any enemy's box overlaps the player's
+        player_center = 0.5 * (player_bounding_box[:2] + player_bounding_box[2:])
+        player_half_size = 0.5 * (player_bounding_box[2:] - player_bounding_box[:2])
+        return bool(
+            numpy.any(
+                numpy.all(
+                    numpy.abs(self.positions - player_center)
+                    <= self._half_size + player_half_size,
+                    axis=1,
+                )
+            )
+        )
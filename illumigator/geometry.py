@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+import functools
 import arcade
 import numpy
 import math
@@ -15,6 +16,10 @@ class Geometry(ABC):
     def draw(self):
         pass
 
+    @abstractmethod
+    def create_shape(self):  # Retained version of draw, returns an arcade Shape
+        pass
+
     @abstractmethod
     def get_intersection(self, ray) -> tuple:
         pass
@@ -23,6 +28,10 @@ class Geometry(ABC):
     def move(self, world_object_center, move_distance, rotate_angle=0):
         pass
 
+    @abstractmethod
+    def get_bounding_box(self) -> numpy.ndarray:  # [min_x, min_y, max_x, max_y]
+        pass
+
 
 class Line(Geometry):
     def __init__(
@@ -70,6 +79,14 @@ class Line(Geometry):
         if self.is_reflective or self.is_refractive:
             self.calculate_normal()
 
+    def get_bounding_box(self) -> numpy.ndarray:
+        return numpy.concatenate(
+            (
+                numpy.minimum(self._point1, self._point2),
+                numpy.maximum(self._point1, self._point2),
+            )
+        )
+
     def calculate_normal(self):
         normal_unscaled = numpy.array(
             [-(self._point2[1] - self._point1[1]), self._point2[0] - self._point1[0]]
@@ -97,6 +114,15 @@ class Line(Geometry):
                 arcade.color.BLUE,
             )
 
+    def create_shape(self):
+        return arcade.create_line(
+            self._point1[0],
+            self._point1[1],
+            self._point2[0],
+            self._point2[1],
+            arcade.color.WHITE if self.is_reflective else arcade.color.BLUE,
+        )
+
 
 class Circle(Geometry):
     def __init__(
@@ -141,11 +167,23 @@ class Circle(Geometry):
             + move_distance
         )
 
+    def get_bounding_box(self) -> numpy.ndarray:
+        return numpy.concatenate((self.center - self.radius, self.center + self.radius))
+
     def draw(self):
         arcade.draw_circle_outline(
             self.center[0], self.center[1], self.radius, arcade.color.MAGENTA
         )
 
+    def create_shape(self):
+        return arcade.create_ellipse_outline(
+            self.center[0],
+            self.center[1],
+            2 * self.radius,
+            2 * self.radius,
+            arcade.color.MAGENTA,
+        )
+
 
 class Arc(Geometry):
     def __init__(
@@ -254,6 +292,9 @@ class Arc(Geometry):
         self._end_angle += rotate_angle
         self._constrain_angles()
 
+    def get_bounding_box(self) -> numpy.ndarray:  # Bounds of the full circle
+        return numpy.concatenate((self.center - self.radius, self.center + self.radius))
+
     def draw(self):
         if self._start_angle < self._end_angle:
             arcade.draw_arc_outline(
@@ -280,6 +321,19 @@ class Arc(Geometry):
                 num_segments=512,
             )
 
+    def create_shape(self):
+        end_angle = self._end_angle
+        if self._start_angle >= end_angle:
+            end_angle += 2 * numpy.pi
+        # Offsets are cached starting at angle 0 and rotated to the arc's start
+        # here. The width is rounded since rotating both angles leaves float noise
+        offsets = get_arc_offsets(self.radius, round(end_angle - self._start_angle, 9))
+        cos, sin = math.cos(self._start_angle), math.sin(self._start_angle)
+        rotation = numpy.array([[cos, sin], [-sin, cos]])
+        return arcade.create_line_strip(
+            offsets @ rotation + self.center, arcade.color.MAGENTA, line_width=3
+        )
+
     def get_refracted_direction(self, ray, point: numpy.ndarray):
         # Determine normal
         normal = (point - self.center) / self.radius
@@ -299,3 +353,13 @@ class Arc(Geometry):
             if util.two_d_cross_product(ray._direction, normal) > 0:
                 angle = -angle
             return util.rotate_around_center(numpy.zeros(2), normal, angle)
+
+
+@functools.lru_cache(maxsize=256)
+def get_arc_offsets(radius: float, angular_width: float):
+    # Points along an arc from angle 0 to angular_width relative to its center,
+    # shared by every arc with the same radius and width whatever its rotation
+    angles = numpy.linspace(0, angular_width, util.DEBUG_ARC_SEGMENTS + 1)
+    offsets = radius * numpy.column_stack((numpy.cos(angles), numpy.sin(angles)))
+    offsets.setflags(write=False)
+    return offsets
@@ -0,0 +1,335 @@
+import math
+import numpy
+
+from illumigator import geometry
+from illumigator import util
+
+
+def get_line_intersection_distances(
+    origins: numpy.ndarray,
+    directions: numpy.ndarray,
+    point1: numpy.ndarray,
+    point2: numpy.ndarray,
+) -> numpy.ndarray:
+    """
+    Vectorized version of Line.get_intersection. Rays and lines are (..., 2) arrays
+    that broadcast against each other: (R, 1, 2) rays against (N, 2) lines give an
+    (R, N) array, (P, 2) rays against (P, 2) lines test P pairs. Returns the
+    distances along each ray's direction, inf on a miss.
+    """
+    x1, y1 = point1[..., 0], point1[..., 1]
+    segment_dx, segment_dy = point2[..., 0] - x1, point2[..., 1] - y1
+    x3, y3 = origins[..., 0], origins[..., 1]
+    dx, dy = directions[..., 0], directions[..., 1]
+
+    denominator = segment_dx * dy - segment_dy * dx
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        t = ((y1 - y3) * dx - (x1 - x3) * dy) / denominator
+        u = (segment_dx * (y1 - y3) - segment_dy * (x1 - x3)) / denominator
+
+    hit = (denominator != 0) & (t > 0) & (t < 1) & (u > 0)
+    return numpy.where(hit, u, numpy.inf)
+
+
+def get_curve_intersection_distances(
+    origins: numpy.ndarray,
+    directions: numpy.ndarray,
+    centers: numpy.ndarray,
+    radii: numpy.ndarray,
+    start_directions: numpy.ndarray,
+    end_directions: numpy.ndarray,
+    is_arc: numpy.ndarray,
+) -> numpy.ndarray:
+    """
+    Vectorized version of Circle/Arc.get_intersection, rays and curves broadcast
+    like in get_line_intersection_distances. Arc membership is tested with cross
+    products against the unit vectors of the arc's start and end angles instead of
+    atan2, which holds for arcs up to PI. Returns the distances along each ray's
+    direction, inf on a miss.
+    """
+    relative_x = origins[..., 0] - centers[..., 0]
+    relative_y = origins[..., 1] - centers[..., 1]
+    dx, dy = directions[..., 0], directions[..., 1]
+    start_x, start_y = start_directions[..., 0], start_directions[..., 1]
+    end_x, end_y = end_directions[..., 0], end_directions[..., 1]
+
+    temp_calculation1 = dx * relative_x + dy * relative_y
+    nabla = temp_calculation1 * temp_calculation1 - (
+        relative_x * relative_x + relative_y * relative_y - radii * radii
+    )
+    nabla_sqrt = numpy.sqrt(numpy.maximum(nabla, 0))
+
+    distances = numpy.full(nabla.shape, numpy.inf)
+    for intersection_distance in (
+        nabla_sqrt - temp_calculation1,
+        -nabla_sqrt - temp_calculation1,
+    ):
+        point_x = relative_x + intersection_distance * dx
+        point_y = relative_y + intersection_distance * dy
+        in_arc = ~is_arc | (
+            (start_x * point_y - start_y * point_x > 0)
+            & (point_x * end_y - point_y * end_x > 0)
+        )
+        hit = (nabla >= 0) & (intersection_distance > 0) & in_arc
+        distances = numpy.where(
+            hit, numpy.minimum(distances, intersection_distance), distances
+        )
+    return distances
+
+
+class IntersectionEngine:
+    """
+    Packs the geometry of a set of world objects into contiguous arrays so the
+    nearest intersection of a whole batch of rays can be resolved in one call.
+    Geometry.get_intersection remains the reference implementation.
+
+    Static geometry is packed once into read-only arrays; only the small dynamic
+    arrays are rewritten when a dynamic world object moves. Static segments come
+    first in the segment index space.
+    """
+
+    def __init__(
+        self,
+        static_world_objects: list,
+        dynamic_world_objects: list = (),
+        static_points: tuple = None,
+    ):
+        self._segments: list[geometry.Geometry] = []
+        self._world_objects = []
+        self._world_object_segment_indices = {}
+        for wo in list(static_world_objects) + list(dynamic_world_objects):
+            self._world_object_segment_indices[wo] = []
+            for segment in wo._geometry_segments:
+                self._world_object_segment_indices[wo].append(len(self._segments))
+                self._segments.append(segment)
+                self._world_objects.append(wo)
+        self.static_segment_count = sum(
+            len(wo._geometry_segments) for wo in static_world_objects
+        )
+
+        # Row of each segment in its partition's packed line arrays, -1 for curves
+        is_line = numpy.array(
+            [isinstance(segment, geometry.Line) for segment in self._segments],
+            dtype=bool,
+        )
+        is_static = numpy.arange(len(self._segments)) < self.static_segment_count
+        self._static_line_columns = numpy.flatnonzero(is_line & is_static)
+        self._dynamic_line_columns = numpy.flatnonzero(is_line & ~is_static)
+        self._curve_columns = numpy.flatnonzero(~is_line)
+        self._line_rows = numpy.full(len(self._segments), -1, dtype=int)
+        self._line_rows[self._static_line_columns] = numpy.arange(
+            len(self._static_line_columns)
+        )
+        self._line_rows[self._dynamic_line_columns] = numpy.arange(
+            len(self._dynamic_line_columns)
+        )
+        self._curve_rows = numpy.full(len(self._segments), -1, dtype=int)
+        self._curve_rows[self._curve_columns] = numpy.arange(len(self._curve_columns))
+
+        # static_points are the (point1, point2) arrays of an earlier engine over the
+        # same static geometry, see get_static_points
+        if static_points is not None:
+            self._static_point1, self._static_point2 = static_points
+        else:
+            self._static_point1 = numpy.array(
+                [self._segments[index]._point1 for index in self._static_line_columns]
+            ).reshape(-1, 2)
+            self._static_point2 = numpy.array(
+                [self._segments[index]._point2 for index in self._static_line_columns]
+            ).reshape(-1, 2)
+        self._static_point1.setflags(write=False)
+        self._static_point2.setflags(write=False)
+        self._dynamic_point1 = numpy.zeros((len(self._dynamic_line_columns), 2))
+        self._dynamic_point2 = numpy.zeros((len(self._dynamic_line_columns), 2))
+        for index in self._dynamic_line_columns:
+            self._update_segment(index)
+
+        # Curved segments are few, so static and dynamic ones share their arrays
+        num_curves = len(self._curve_columns)
+        self._curve_centers = numpy.zeros((num_curves, 2))
+        self._curve_radii = numpy.zeros(num_curves)
+        self._curve_start_directions = numpy.zeros((num_curves, 2))
+        self._curve_end_directions = numpy.zeros((num_curves, 2))
+        self._curve_is_arc = numpy.zeros(num_curves, dtype=bool)
+        for index in self._curve_columns:
+            self._update_segment(index)
+
+        self._all_indices = numpy.arange(len(self._segments))
+        self.broadphase = None
+
+    def update_world_object(self, world_object):
+        for index in self._world_object_segment_indices.get(world_object, ()):
+            self._update_segment(index)
+
+    def _update_segment(self, index: int):
+        segment = self._segments[index]
+        row = self._line_rows[index]
+        if row >= 0:
+            self._dynamic_point1[row] = segment._point1
+            self._dynamic_point2[row] = segment._point2
+            return
+
+        row = self._curve_rows[index]
+        self._curve_centers[row] = segment.center
+        self._curve_radii[row] = segment.radius
+        if isinstance(segment, geometry.Arc):
+            self._curve_is_arc[row] = True
+            self._curve_start_directions[row] = [
+                math.cos(segment._start_angle),
+                math.sin(segment._start_angle),
+            ]
+            self._curve_end_directions[row] = [
+                math.cos(segment._end_angle),
+                math.sin(segment._end_angle),
+            ]
+
+    def get_static_points(self) -> tuple:
+        return self._static_point1, self._static_point2
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    def get_segment(self, index: int) -> geometry.Geometry:
+        return self._segments[index]
+
+    def get_world_object(self, index: int):
+        return self._world_objects[index]
+
+    def get_world_object_segment_indices(self, world_object) -> list:
+        return self._world_object_segment_indices.get(world_object, [])
+
+    def get_intersection_distances(
+        self,
+        origins: numpy.ndarray,
+        directions: numpy.ndarray,
+        candidates: numpy.ndarray = None,
+    ) -> numpy.ndarray:
+        """
+        Returns an (R, C) array of distances along each ray's direction to each
+        candidate segment (all segments by default), inf on a miss.
+        """
+        if candidates is None:
+            candidates = self._all_indices
+            partitions = (
+                (
+                    self._static_line_columns,
+                    self._static_point1,
+                    self._static_point2,
+                ),
+                (
+                    self._dynamic_line_columns,
+                    self._dynamic_point1,
+                    self._dynamic_point2,
+                ),
+            )
+            curve_columns = self._curve_columns
+        else:
+            rows = self._line_rows[candidates]
+            is_static = candidates < self.static_segment_count
+            static_columns = numpy.flatnonzero((rows >= 0) & is_static)
+            dynamic_columns = numpy.flatnonzero((rows >= 0) & ~is_static)
+            partitions = (
+                (
+                    static_columns,
+                    self._static_point1[rows[static_columns]],
+                    self._static_point2[rows[static_columns]],
+                ),
+                (
+                    dynamic_columns,
+                    self._dynamic_point1[rows[dynamic_columns]],
+                    self._dynamic_point2[rows[dynamic_columns]],
+                ),
+            )
+            curve_columns = numpy.flatnonzero(rows < 0)
+
+        distances = numpy.full((len(origins), len(candidates)), numpy.inf)
+        for columns, point1, point2 in partitions:
+            if len(columns) > 0:
+                distances[:, columns] = get_line_intersection_distances(
+                    origins[:, None], directions[:, None], point1, point2
+                )
+        if len(curve_columns) > 0:
+            curve_rows = self._curve_rows[candidates[curve_columns]]
+            distances[:, curve_columns] = get_curve_intersection_distances(
+                origins[:, None],
+                directions[:, None],
+                self._curve_centers[curve_rows],
+                self._curve_radii[curve_rows],
+                self._curve_start_directions[curve_rows],
+                self._curve_end_directions[curve_rows],
+                self._curve_is_arc[curve_rows],
+            )
+        return distances
+
+    def get_pair_intersection_distances(
+        self,
+        origins: numpy.ndarray,
+        directions: numpy.ndarray,
+        segment_indices: numpy.ndarray,
+    ) -> numpy.ndarray:
+        # Distances for P (ray, segment) pairs given as (P, 2) rays and P indices
+        distances = numpy.full(len(segment_indices), numpy.inf)
+        rows = self._line_rows[segment_indices]
+        is_static = segment_indices < self.static_segment_count
+        for pairs, point1, point2 in (
+            (
+                numpy.flatnonzero((rows >= 0) & is_static),
+                self._static_point1,
+                self._static_point2,
+            ),
+            (
+                numpy.flatnonzero((rows >= 0) & ~is_static),
+                self._dynamic_point1,
+                self._dynamic_point2,
+            ),
+        ):
+            if len(pairs) > 0:
+                distances[pairs] = get_line_intersection_distances(
+                    origins[pairs],
+                    directions[pairs],
+                    point1[rows[pairs]],
+                    point2[rows[pairs]],
+                )
+        curve_pairs = numpy.flatnonzero(rows < 0)
+        if len(curve_pairs) > 0:
+            curve_rows = self._curve_rows[segment_indices[curve_pairs]]
+            distances[curve_pairs] = get_curve_intersection_distances(
+                origins[curve_pairs],
+                directions[curve_pairs],
+                self._curve_centers[curve_rows],
+                self._curve_radii[curve_rows],
+                self._curve_start_directions[curve_rows],
+                self._curve_end_directions[curve_rows],
+                self._curve_is_arc[curve_rows],
+            )
+        return distances
+
+    def get_nearest_intersections(
+        self, origins: numpy.ndarray, directions: numpy.ndarray
+    ) -> tuple:
+        """
+        Returns (indices, points) for R rays given as (R, 2) arrays. indices holds the
+        nearest segment index of each ray, or -1 where the ray hits nothing.
+        """
+        indices = numpy.full(len(origins), -1, dtype=int)
+        points = origins + directions * util.MAX_RAY_DISTANCE
+        if len(self._segments) == 0:
+            return indices, points
+
+        if self.broadphase is None:
+            distances = self.get_intersection_distances(origins, directions)
+            nearest = numpy.argmin(distances, axis=1)
+            nearest_distances = distances[numpy.arange(len(origins)), nearest]
+        else:
+            nearest, nearest_distances = self.broadphase.get_nearest_intersections(
+                origins, directions
+            )
+
+        hit = (
+            nearest_distances * nearest_distances * numpy.sum(directions**2, axis=1)
+            < util.STARTING_DISTANCE_VALUE
+        )
+        indices[hit] = nearest[hit]
+        points[hit] = origins[hit] + directions[hit] * nearest_distances[hit, None]
+        return indices, points
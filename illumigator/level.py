@@ -1,7 +1,11 @@
+from typing import Union
+import arcade
 import numpy
 
 from illumigator import worldobjects, geometry, entity, util
-from util import WALL_SIZE
+from illumigator import intersection, light, broadphase, bvh, rendering, collision
+from illumigator import navigation
+from illumigator.util import WALL_SIZE
 
 
 class Level:
@@ -13,6 +17,9 @@ class Level:
         light_source_coordinate_list: list[list] = None,
         animated_wall_coordinate_list: list[list] = None,
         name="default",
+        lens_coordinate_list: list[list] = None,
+        compiled: dict = None,
+        create_sprites=True,
     ):
         self.background = None
         self.name = name
@@ -20,6 +27,7 @@ class Level:
         self.mirror_list = []
         self.light_receiver_list = []
         self.light_sources_list = []
+        self.animated_wall_list = []
 
         # ========================= Outer Walls =========================
         self.wall_list: list[worldobjects.WorldObject] = [
@@ -117,13 +125,237 @@ class Level:
                                            animated_wall_coordinates[7], animated_wall_coordinates[8])
 
             self.wall_list.append(animated_wall)
+            self.animated_wall_list.append(animated_wall)
 
+        for lens_coordinates in lens_coordinate_list or []:
+            self.wall_list.append(
+                worldobjects.Lens(
+                    numpy.array([lens_coordinates[0], lens_coordinates[1]]),
+                    lens_coordinates[2],
+                )
+            )
+
+        # ========================= Static/Dynamic Partition =========================
+        # Objects that can never move are packed once into immutable structures,
+        # only the dynamic ones are tracked and updated when they move
+        self.static_object_list: list[worldobjects.WorldObject] = [
+            wall for wall in self.wall_list if wall.obj_animation is None
+        ] + self.light_receiver_list
+        self._dynamic_geometry_list: list[worldobjects.WorldObject] = (
+            self.mirror_list + self.animated_wall_list
+        )
+
+        # compiled holds arrays derived from the same coordinates by an earlier
+        # Level's get_compiled_arrays, which are reused instead of recomputed
+        compiled = compiled or {}
+        static_points = None
+        if "static_point1" in compiled:
+            static_points = (compiled["static_point1"], compiled["static_point2"])
+        self.intersection_engine = intersection.IntersectionEngine(
+            self.static_object_list, self._dynamic_geometry_list, static_points
+        )
+        if self.intersection_engine.segment_count >= util.BROADPHASE_MIN_SEGMENTS:
+            if util.RAY_BROADPHASE == "grid":
+                static_cells = None
+                if "static_cell_offsets" in compiled:
+                    static_cells = (
+                        compiled["static_cell_offsets"],
+                        compiled["static_cell_indices"],
+                    )
+                self.intersection_engine.broadphase = broadphase.UniformGrid(
+                    self.intersection_engine, static_cells=static_cells
+                )
+            elif util.RAY_BROADPHASE == "bvh":
+                self.intersection_engine.broadphase = bvh.BoundingVolumeHierarchy(
+                    self.intersection_engine
+                )
+
+        # Created by create_sprites
+        self._static_sprite_list = None
+        self._dynamic_sprite_list = None
+        self._light_source_sprite_list = None
+        self._light_receiver_sprite_list = None
+
+        # ========================= Collision Index =========================
+        # Characters collide with the exact oriented boxes of nearby objects, which
+        # works without sprites
+        self._collidable_object_list = [
+            world_object
+            for world_object in (
+                self.wall_list + self.mirror_list + self.light_receiver_list
+            )
+            if world_object.get_oriented_bounding_box() is not None
+        ]
+        collision_bounds = compiled.get("collision_bounds")
+        if collision_bounds is None:
+            collision_bounds = [
+                world_object.get_bounding_box()
+                for world_object in self._collidable_object_list
+            ]
+        self.collision_index = collision.SpatialHash()
+        for world_object, bounding_box in zip(
+            self._collidable_object_list, collision_bounds
+        ):
+            self.collision_index.insert(world_object, bounding_box)
+        self.collision_boxes = collision.OrientedBoxSet(self._collidable_object_list)
+        self.navigation_grid = navigation.NavigationGrid(
+            self, blocked=compiled.get("navigation_blocked")
+        )
+
+        self._world_object_bounds = {}
+        self._moved_world_objects = set()
+        self._changed_regions = []
+        # Built on the first draw with DEBUG_GEOMETRY, the static objects in a batch
+        # of their own so objects moving never rebuild theirs
+        self._static_geometry_overlay = None
+        self._geometry_overlay = None
+        self._stale_overlay_objects = set()
+        # Sources are always tracked since DEBUG_LIGHT_SOURCES can be toggled in game
+        for world_object in self._dynamic_geometry_list + self.light_sources_list:
+            self._world_object_bounds[world_object] = world_object.get_bounding_box()
+            world_object.add_move_listener(self._on_world_object_moved)
+
+        # Levels built on another thread leave the sprites to the main thread,
+        # the snapshot reset restores is taken once they exist
+        if create_sprites:
+            self.create_sprites()
+        else:
+            self._initial_snapshot = self.get_snapshot()
+
+    # ========================= Sprites =========================
+    def create_sprites(self):
+        # Must run on the main thread before the level is first updated
+        for world_object in (
+            self.wall_list
+            + self.mirror_list
+            + self.light_sources_list
+            + self.light_receiver_list
+        ):
+            world_object.create_sprites()
+
+        # One list per kind of object so the number of draw calls doesn't grow with
+        # the number of objects, objects only keep handles to their sprites
+        self._static_sprite_list = self._create_sprite_list(
+            [wall for wall in self.wall_list if wall.obj_animation is None],
+            use_spatial_hash=True,
+        )
+        self._dynamic_sprite_list = self._create_sprite_list(
+            self._dynamic_geometry_list
+        )
+        self._light_source_sprite_list = self._create_sprite_list(
+            self.light_sources_list
+        )
+        self._light_receiver_sprite_list = self._create_sprite_list(
+            self.light_receiver_list
+        )
+        self._initial_snapshot = self.get_snapshot()
+
+    # ========================= Compiled Arrays =========================
+    def get_compiled_arrays(self) -> dict:
+        # Everything Level derives from its coordinates that is worth not deriving
+        # again, only valid before anything has moved
+        compiled = {
+            "collision_bounds": numpy.array(
+                [
+                    self.collision_index.get_bounds(world_object)
+                    for world_object in self._collidable_object_list
+                ]
+            ).reshape(-1, 4),
+            "navigation_blocked": self.navigation_grid.get_blocked(),
+        }
+        compiled["static_point1"], compiled["static_point2"] = (
+            self.intersection_engine.get_static_points()
+        )
+        if isinstance(self.intersection_engine.broadphase, broadphase.UniformGrid):
+            compiled["static_cell_offsets"], compiled["static_cell_indices"] = (
+                self.intersection_engine.broadphase.get_static_cells()
+            )
+        return compiled
+
+    # ========================= Snapshots =========================
+    def get_snapshot(self) -> dict:
+        # Everything that changes while playing, static objects never do
+        return {
+            "world_objects": [
+                (world_object, world_object.get_state())
+                for world_object in self._dynamic_geometry_list
+                + self.light_sources_list
+            ],
+            "animations": [
+                (animated_wall.obj_animation.t, animated_wall.obj_animation.dt)
+                for animated_wall in self.animated_wall_list
+            ],
+            "charges": [
+                light_receiver.charge for light_receiver in self.light_receiver_list
+            ],
+        }
+
+    def restore_snapshot(self, snapshot: dict):
+        # In place, only the objects that moved since are restored and the
+        # structures derived from them are brought up to date in one pass
+        self._on_world_objects_moved(
+            [
+                world_object
+                for world_object, state in snapshot["world_objects"]
+                if world_object.set_state(state, notify=False)
+            ]
+        )
+        for animated_wall, (t, dt) in zip(
+            self.animated_wall_list, snapshot["animations"]
+        ):
+            animated_wall.obj_animation.t = t
+            animated_wall.obj_animation.dt = dt
+        for light_receiver, charge in zip(
+            self.light_receiver_list, snapshot["charges"]
+        ):
+            light_receiver.charge = charge
+
+    def reset(self):
+        self.restore_snapshot(self._initial_snapshot)
+
+    @staticmethod
+    def _create_sprite_list(world_objects: list, use_spatial_hash=False):
+        # Headless levels have no sprites, a plain list keeps arcade out of the way
+        if util.HEADLESS:
+            sprite_list = []
+        else:
+            sprite_list = arcade.SpriteList(use_spatial_hash=use_spatial_hash)
+        for world_object in world_objects:
+            sprite_list.extend(world_object.get_sprites())
+        return sprite_list
+
+    def _on_world_object_moved(self, world_object: worldobjects.WorldObject):
+        self._on_world_objects_moved([world_object])
 
+    def _on_world_objects_moved(self, world_objects: list):
+        navigation_regions = []
+        for world_object in world_objects:
+            if isinstance(world_object, worldobjects.LightSource):
+                world_object._needs_full_trace = True
+            old_bounds = self._world_object_bounds[world_object]
+            new_bounds = world_object.get_bounding_box()
+            self._moved_world_objects.add(world_object)
+            self._changed_regions.append(old_bounds)
+            self._changed_regions.append(new_bounds)
+            self._world_object_bounds[world_object] = new_bounds
+            if self._geometry_overlay is not None:
+                self._stale_overlay_objects.add(world_object)
+            if world_object in self.collision_index:
+                self.collision_index.update(world_object, new_bounds)
+                self.collision_boxes.update_world_object(world_object)
+                navigation_regions.append(old_bounds)
+                navigation_regions.append(new_bounds)
+            self.intersection_engine.update_world_object(world_object)
+            if self.intersection_engine.broadphase is not None:
+                self.intersection_engine.broadphase.update_world_object(world_object)
+        # One navigation update for all the objects, their regions often overlap
+        if len(navigation_regions) > 0:
+            self.navigation_grid.update_regions(numpy.array(navigation_regions))
 
-    def update(self, character: entity.Character, mouse_x, mouse_y):
-        for wall in self.wall_list:
-            if wall.obj_animation is not None:
-                wall.apply_object_animation(character)
+    def update(self, character: Union[entity.Character, None], mouse_x, mouse_y):
+        # character may be None to run the level's physics headless
+        for animated_wall in self.animated_wall_list:
+            animated_wall.apply_object_animation(character)
         for light_source in self.light_sources_list:
             if util.DEBUG_LIGHT_SOURCES:
                 light_source.move(
@@ -132,35 +364,115 @@ class Level:
                         mouse_y - light_source._position[1],
                     ])
                 )
-            light_source.cast_rays(
-                self.wall_list +
-                self.mirror_list +
-                self.light_receiver_list +
-                self.light_sources_list
-            )
+
+        # Only re-trace rays whose paths could have been changed by the geometry
+        # that moved since the last update, the rest keep their ray trees
+        changed_regions = numpy.array(self._changed_regions).reshape(-1, 4)
+        stale_rays = []
+        stale_light_sources = []
+        for light_source in self.light_sources_list:
+            if light_source._needs_full_trace:
+                light_source_stale_rays = light_source._light_rays
+            elif len(changed_regions) > 0:
+                light_source_stale_rays = [
+                    ray
+                    for ray in light_source._light_rays
+                    if ray.is_path_affected(self._moved_world_objects, changed_regions)
+                ]
+            else:
+                continue
+            if len(light_source_stale_rays) > 0:
+                stale_rays.extend(light_source_stale_rays)
+                stale_light_sources.append(light_source)
+        self._moved_world_objects = set()
+        self._changed_regions = []
+
+        light.cast_rays(stale_rays, self.intersection_engine)
+        for ray in stale_rays:
+            ray.update_path_bounds()
+        for light_source in stale_light_sources:
+            light_source.on_rays_traced()
+            light_source._needs_full_trace = False
+
+        for light_source in self.light_sources_list:
+            light_source.charge_receivers()
         for light_receiver in self.light_receiver_list:
             light_receiver.charge *= util.CHARGE_DECAY
 
     def draw(self):
-        for wall in self.wall_list:
-            wall.draw()
-        for mirror in self.mirror_list:
-            mirror.draw()
+        self._static_sprite_list.draw(pixelated=True)
+        self._dynamic_sprite_list.draw(pixelated=True)
         for light_source in self.light_sources_list:
             light_source.draw()
+        self._light_source_sprite_list.draw(pixelated=True)
         for light_receiver in self.light_receiver_list:
             light_receiver.draw()
+        self._light_receiver_sprite_list.draw(pixelated=True)
+        if util.DEBUG_GEOMETRY:
+            self._draw_geometry_overlay()
 
-    def check_collisions(self, character: entity.Character):
-        for wall in self.wall_list:
-            if wall.check_collision(character.character_sprite):
-                return True
-        for mirror in self.mirror_list:
-            if mirror.check_collision(character.character_sprite):
-                return True
-        for light_receiver in self.light_receiver_list:
-            if light_receiver.check_collision(character.character_sprite):
-                return True
+    def _draw_geometry_overlay(self):
+        # Only the groups of objects that moved since the last draw are replaced
+        if self._geometry_overlay is None:
+            self._static_geometry_overlay = rendering.LineBatch()
+            for world_object in self.static_object_list:
+                self._static_geometry_overlay.set_shapes(
+                    world_object, world_object.create_geometry_shapes()
+                )
+            self._geometry_overlay = rendering.LineBatch()
+            self._stale_overlay_objects = set(
+                self._dynamic_geometry_list + self.light_sources_list
+            )
+        for world_object in self._stale_overlay_objects:
+            self._geometry_overlay.set_shapes(
+                world_object, world_object.create_geometry_shapes()
+            )
+        self._stale_overlay_objects = set()
+        self._static_geometry_overlay.draw()
+        self._geometry_overlay.draw()
+
+    def check_collisions(
+        self,
+        character: entity.Character,
+        displacement: numpy.ndarray = numpy.zeros(2),
+    ) -> bool:
+        # True if the character would collide with anything while moving by
+        # displacement from where it is now
+        character_sprite = character.character_sprite
+        return self.check_box_collision(
+            numpy.array(
+                [
+                    character_sprite.left,
+                    character_sprite.bottom,
+                    character_sprite.right,
+                    character_sprite.top,
+                ]
+            ),
+            displacement,
+        )
+
+    def check_box_collision(
+        self,
+        bounding_box: numpy.ndarray,
+        displacement: numpy.ndarray = numpy.zeros(2),
+    ) -> bool:
+        # bounding_box is [min_x, min_y, max_x, max_y], only objects overlapping the
+        # area swept by the box are tested exactly
+        swept_bounds = numpy.concatenate(
+            (
+                bounding_box[:2] + numpy.minimum(displacement, 0),
+                bounding_box[2:] + numpy.maximum(displacement, 0),
+            )
+        )
+        return self.collision_boxes.check_box_collision(
+            self.collision_index.query(swept_bounds), bounding_box, displacement
+        )
+
+    def check_box_collisions(
+        self, bounding_boxes: numpy.ndarray, displacements: numpy.ndarray
+    ) -> numpy.ndarray:
+        # check_box_collision for (N,4) boxes and (N,2) displacements at once
+        return self.collision_boxes.get_box_collisions(bounding_boxes, displacements)
 
 
 def load_test_level():
@@ -181,26 +493,28 @@ def load_test_level():
         [3.5 * WALL_SIZE, 1.5 * WALL_SIZE, numpy.pi / 2]
     ]
 
-    lvl = Level(
+    lens_coordinate_list = [
+        [8.5 * WALL_SIZE, 4.5 * WALL_SIZE, 0]
+    ]
+
+    return Level(
         wall_coordinate_list,
         mirror_coordinate_list,
         light_receiver_coordinate_list,
-        light_source_coordinate_list
+        light_source_coordinate_list,
+        [],
+        lens_coordinate_list=lens_coordinate_list
     )
 
-    lvl.wall_list.append(worldobjects.Lens(
-        numpy.array([8.5 * WALL_SIZE, 4.5 * WALL_SIZE]),
-        0
-    ))
-
-    return lvl
-
 
-def load_level(level: dict) -> Level:
+def load_level(level: dict, compiled: dict = None, create_sprites=True) -> Level:
     level_data = level["level_data"]
     return Level(level_data["wall_coordinate_list"],
                  level_data["mirror_coordinate_list"],
                  level_data["light_receiver_coordinate_list"],
                  level_data["light_source_coordinate_list"],
                  level_data["animated_wall_coordinate_list"],
-                 level["level_name"])
+                 level["level_name"],
+                 level_data.get("lens_coordinate_list", []),
+                 compiled,
+                 create_sprites)
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import numpy
+
+from illumigator import level, util
+
+# Bumped whenever the meaning of the compiled arrays changes
+CACHE_VERSION = 1
+
+
+def load_level(level_data: dict, source_path: str, create_sprites=True) -> level.Level:
+    """
+    level.load_level for level data read from source_path, reusing the arrays
+    compiled by an earlier load of the same file. The JSON stays the source of
+    truth, compiled arrays are rebuilt whenever it changes.
+    """
+    cache_path = get_cache_path(source_path)
+    compiled = read_compiled_arrays(cache_path, source_path)
+    loaded_level = level.load_level(level_data, compiled, create_sprites)
+    if compiled is None:
+        try:
+            write_compiled_arrays(
+                cache_path, source_path, loaded_level.get_compiled_arrays()
+            )
+        except OSError:  # Read-only install, compile again next time
+            pass
+    return loaded_level
+
+
+def get_cache_path(source_path: str) -> str:
+    # levels/system/level_1.json is cached in cache/system_level_1/
+    directory, filename = os.path.split(os.path.abspath(source_path))
+    name = os.path.basename(directory) + "_" + os.path.splitext(filename)[0]
+    return os.path.join(util.CACHE_PATH, name)
+
+
+def get_settings() -> dict:
+    # Settings the compiled arrays depend on besides the level itself
+    return {
+        "version": CACHE_VERSION,
+        "world_size": [util.WORLD_WIDTH, util.WORLD_HEIGHT],
+        "ray_broadphase": util.RAY_BROADPHASE,
+        "broadphase_min_segments": util.BROADPHASE_MIN_SEGMENTS,
+        "grid_cell_size": util.GRID_CELL_SIZE,
+        "navigation_cell_size": util.NAVIGATION_CELL_SIZE,
+        "navigation_agent_size": util.NAVIGATION_AGENT_SIZE,
+        # Object geometry and collision boxes are sized from their sprites, as
+        # lists since that is how they read back from meta.json
+        "sprite_info": [
+            list(sprite_info)
+            for sprite_info in (
+                util.WALL_SPRITE_INFO,
+                util.MIRROR_SPRITE_INFO,
+                util.RECEIVER_SPRITE_INFO,
+                util.PLACEHOLDER_SPRITE_INFO,
+            )
+        ],
+    }
+
+
+def get_file_hash(path: str) -> str:
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def read_compiled_arrays(cache_path: str, source_path: str) -> dict:
+    # Returns the arrays memory-mapped read-only, or None if they are missing or
+    # out of date
+    meta_path = os.path.join(cache_path, "meta.json")
+    # A meta.json that is malformed, truncated or from an older format is a miss
+    try:
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+        source_mtime = os.stat(source_path).st_mtime_ns
+        if meta["settings"] != get_settings():
+            return None
+        # Only hash the source when its modification time changed, saving or
+        # copying a file without changing it leaves the cache valid
+        is_source_touched = meta["source_mtime"] != source_mtime
+        if is_source_touched and meta["source_sha256"] != get_file_hash(source_path):
+            return None
+        array_names = [str(name) for name in meta["arrays"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if is_source_touched:
+        meta["source_mtime"] = source_mtime
+        try:
+            with open(meta_path, "w") as meta_file:
+                json.dump(meta, meta_file)
+        except OSError:
+            pass
+
+    compiled = {}
+    try:
+        for name in array_names:
+            # Plain views of the mapped files, indexing memmap objects is slow
+            compiled[name] = numpy.asarray(
+                numpy.load(os.path.join(cache_path, name + ".npy"), mmap_mode="r")
+            )
+    except (OSError, ValueError):
+        return None
+    return compiled
+
+
+def write_compiled_arrays(cache_path: str, source_path: str, compiled: dict):
+    meta_path = os.path.join(cache_path, "meta.json")
+    os.makedirs(cache_path, exist_ok=True)
+    # meta.json is written last, so a partly written cache is never read
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    for name, array in compiled.items():
+        numpy.save(os.path.join(cache_path, name + ".npy"), array)
+
+    meta = {
+        "settings": get_settings(),
+        "source_mtime": os.stat(source_path).st_mtime_ns,
+        "source_sha256": get_file_hash(source_path),
+        "arrays": list(compiled),
+    }
+    with open(meta_path, "w") as meta_file:
+        json.dump(meta, meta_file)
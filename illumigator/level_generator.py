@@ -0,0 +1,155 @@
+import argparse
+import json
+import math
+import numpy
+import os
+
+# Run as a script, generating levels needs no display. Set before util is imported
+# since importing it queries the screen otherwise
+if __name__ == "__main__":
+    os.environ.setdefault("ILLUMIGATOR_HEADLESS", "1")
+
+from illumigator import util  # noqa: E402
+
+# Keep generated objects clear of the outer walls
+MARGIN = 2 * util.WALL_SIZE
+MIRROR_PAIR_GAP = 2 * util.WALL_SIZE
+MIRROR_PAIR_MAX_SKEW = 0.002  # Radians, small enough for long bounce chains
+
+
+def generate_level(
+    seed: int = 0,
+    num_walls: int = 20,
+    num_mirrors: int = 6,
+    num_mirror_pairs: int = 2,
+    num_lenses: int = 0,
+    num_receivers: int = 1,
+    num_sources: int = 2,
+    num_animated_walls: int = 1,
+    max_wall_length: int = 5,
+    name: str = None,
+    num_enemies: int = 0,
+) -> dict:
+    """
+    Returns a level dict in the format read by level.load_level. The same seed and
+    counts always produce the same level. Mirror pairs are two mirrors facing each
+    other at a slight skew, and every other source sits between a pair shining at
+    one of its faces so light bounces between them for many generations.
+    """
+    rng = numpy.random.default_rng(seed)
+
+    def random_position(margin: float = MARGIN) -> list:
+        return [
+            round(float(rng.uniform(margin, util.WORLD_WIDTH - margin)), 2),
+            round(float(rng.uniform(margin, util.WORLD_HEIGHT - margin)), 2),
+        ]
+
+    def random_angle(max_angle: float = 2 * math.pi) -> float:
+        return round(float(rng.uniform(0, max_angle)), 6)
+
+    def random_wall() -> list:
+        if rng.random() < 0.5:
+            dimensions = [1, int(rng.integers(1, max_wall_length + 1))]
+        else:
+            dimensions = [int(rng.integers(1, max_wall_length + 1)), 1]
+        return random_position() + dimensions + [random_angle(math.pi)]
+
+    mirror_coordinate_list = [
+        random_position() + [random_angle(math.pi)] for _ in range(num_mirrors)
+    ]
+    mirror_pairs = []
+    for _ in range(num_mirror_pairs):
+        center = numpy.array(random_position(MARGIN + MIRROR_PAIR_GAP))
+        angle = random_angle(math.pi)
+        normal = numpy.array([math.cos(angle), math.sin(angle)])
+        for side in (-1, 1):
+            position = center + side * 0.5 * MIRROR_PAIR_GAP * normal
+            skew = float(rng.uniform(-MIRROR_PAIR_MAX_SKEW, MIRROR_PAIR_MAX_SKEW))
+            mirror_coordinate_list.append(
+                [round(float(position[0]), 2), round(float(position[1]), 2)]
+                + [round(angle + skew, 6)]
+            )
+        mirror_pairs.append((center, angle))
+
+    light_source_coordinate_list = []
+    for index in range(num_sources):
+        if index % 2 == 0 and len(mirror_pairs) > 0:
+            # Parallel source between the mirrors, nearly perpendicular to them
+            center, pair_angle = mirror_pairs[(index // 2) % len(mirror_pairs)]
+            light_source_coordinate_list.append(
+                [round(float(center[0]), 2), round(float(center[1]), 2)]
+                + [round(pair_angle + float(rng.uniform(-0.01, 0.01)), 6)]
+            )
+        elif rng.random() < 0.5:  # Radial source with an angular spread
+            light_source_coordinate_list.append(
+                random_position()
+                + [random_angle(), round(float(rng.uniform(0.1, math.pi / 2)), 6)]
+            )
+        else:
+            light_source_coordinate_list.append(random_position() + [random_angle()])
+
+    animated_wall_coordinate_list = []
+    for _ in range(num_animated_walls):
+        animated_wall_coordinate_list.append(
+            random_wall()
+            + [
+                round(float(rng.uniform(-4, 4) * util.WALL_SIZE), 2),
+                round(float(rng.uniform(-4, 4) * util.WALL_SIZE), 2),
+                round(float(rng.uniform(0.005, 0.03)), 4),
+                random_angle(math.pi),
+            ]
+        )
+
+    level_data = {
+        "wall_coordinate_list": [random_wall() for _ in range(num_walls)],
+        "mirror_coordinate_list": mirror_coordinate_list,
+        "light_receiver_coordinate_list": [
+            random_position() + [random_angle()] for _ in range(num_receivers)
+        ],
+        "light_source_coordinate_list": light_source_coordinate_list,
+        "animated_wall_coordinate_list": animated_wall_coordinate_list,
+        "lens_coordinate_list": [
+            random_position() + [random_angle()] for _ in range(num_lenses)
+        ],
+    }
+    if num_enemies > 0:  # Without the list the game places its default enemy
+        level_data["enemy_coordinate_list"] = [
+            random_position() for _ in range(num_enemies)
+        ]
+    return {"level_name": name or "Generated %d" % seed, "level_data": level_data}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a stress-test level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--walls", type=int, default=20)
+    parser.add_argument("--mirrors", type=int, default=6)
+    parser.add_argument("--mirror-pairs", type=int, default=2)
+    parser.add_argument("--lenses", type=int, default=0)
+    parser.add_argument("--receivers", type=int, default=1)
+    parser.add_argument("--sources", type=int, default=2)
+    parser.add_argument("--animated-walls", type=int, default=1)
+    parser.add_argument("--enemies", type=int, default=0)
+    parser.add_argument("--name")
+    args = parser.parse_args()
+    print(
+        json.dumps(
+            generate_level(
+                args.seed,
+                args.walls,
+                args.mirrors,
+                args.mirror_pairs,
+                args.lenses,
+                args.receivers,
+                args.sources,
+                args.animated_walls,
+                name=args.name,
+                num_enemies=args.enemies,
+            ),
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import concurrent.futures
+
+from illumigator import level_cache, util
+
+# (filename, width, height) of the textures the objects of every level use
+LEVEL_TEXTURES = tuple(
+    (sprite_info[0], sprite_info[2], sprite_info[3])
+    for sprite_info in (
+        util.WALL_SPRITE_INFO,
+        util.MIRROR_SPRITE_INFO,
+        util.SOURCE_SPRITE_INFO,
+        util.RECEIVER_SPRITE_INFO,
+    )
+)
+
+
+class LevelLoader:
+    """
+    Prepares levels on a worker thread so switching to them doesn't stall the
+    game. The level file is parsed there and everything of the Level that doesn't
+    need the GL context is built from it: geometry, intersection engine,
+    broadphase, collision index and navigation grid. The textures of its objects
+    are decoded ahead of time too, which leaves only creating the sprites to the
+    main thread.
+    """
+
+    def __init__(self):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._futures = {}
+
+    def preload(self, level_id: str, is_system_level=True):
+        key = (level_id, is_system_level)
+        if key not in self._futures:
+            self._futures[key] = self._executor.submit(
+                self._prepare, level_id, is_system_level
+            )
+
+    def load(self, level_id: str, is_system_level=True) -> tuple:
+        # Returns (level data, Level), waits for the worker if the level is still
+        # being prepared and prepares it first if it wasn't preloaded
+        self.preload(level_id, is_system_level)
+        level_data, loaded_level = self._futures.pop(
+            (level_id, is_system_level)
+        ).result()
+        loaded_level.create_sprites()
+        return level_data, loaded_level
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _prepare(level_id: str, is_system_level: bool) -> tuple:
+        level_data = util.load_data(level_id, True, is_system_level)
+        loaded_level = level_cache.load_level(
+            level_data,
+            util.get_data_path(level_id, True, is_system_level),
+            create_sprites=False,
+        )
+        if not util.HEADLESS:
+            for filename, width, height in LEVEL_TEXTURES:
+                util.ASSETS.get_texture(
+                    filename, image_width=width, image_height=height
+                )
+        return level_data, loaded_level
@@ -1,3 +1,5 @@
+import threading
+
 from illumigator import util
 
 x_midpoint = util.WORLD_WIDTH // 2
@@ -7,4 +9,19 @@ y_midpoint = util.WORLD_HEIGHT // 2
 class LevelSelector:
     def __init__(self, selection=0):
         self._selection = selection
-        util.update_community_metadata()
+        # Scanning the community directory can take a while, so it doesn't hold up
+        # startup. community_metadata is None until the scan is done
+        self.community_metadata = None
+        self._metadata_thread = threading.Thread(
+            target=self._update_community_metadata, daemon=True
+        )
+        self._metadata_thread.start()
+
+    def _update_community_metadata(self):
+        # Broken level files are skipped by the scan, this catches the directory
+        # itself being unreadable so the selector still gets an (empty) index
+        try:
+            self.community_metadata = util.update_community_metadata()
+        except OSError as error:
+            print("Couldn't scan the community levels: %r" % error)
+            self.community_metadata = {"levels": {}}
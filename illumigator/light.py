@@ -12,8 +12,16 @@ class LightRay:
         self._end = numpy.zeros(2)
         self._child_ray = None
         self._generation = generation
+        self._hit_world_object = None
+        self._path_bounds = numpy.zeros((0, 4))
+        self._path_world_objects = set()
 
     def cast_ray(self, world_objects: list):
+        ray = self
+        while ray is not None:
+            ray = ray._cast_single_generation(world_objects)
+
+    def _cast_single_generation(self, world_objects: list):
         nearest_distance_squared = util.STARTING_DISTANCE_VALUE
         nearest_intersection_worldobject = None
         nearest_intersection_geometry = None
@@ -33,39 +41,66 @@ class LightRay:
                     nearest_intersection_geometry = segment
                     nearest_intersection_point = intersection_point
 
-        if nearest_intersection_point is None:
+        return self._apply_intersection(
+            nearest_intersection_worldobject,
+            nearest_intersection_geometry,
+            nearest_intersection_point,
+        )
+
+    def _apply_intersection(self, world_object, segment, point):
+        # Returns the child ray that still needs to be cast, if any
+        self._hit_world_object = world_object
+        if point is None:
             self._end = self._origin + self._direction * util.MAX_RAY_DISTANCE
             self._child_ray = None
-            return
-
-        self._end = nearest_intersection_point
-        if (
-            nearest_intersection_worldobject._is_receiver
-        ):  # Charge receiver when a light ray hits it
-            nearest_intersection_worldobject.charge += util.LIGHT_INCREMENT
+            return None
 
+        self._end = point
         if self._generation >= util.MAX_GENERATIONS:
             self._child_ray = None
-            return
+            return None
 
-        if (
-            nearest_intersection_geometry.is_reflective
-        ):  # if the ray hit a mirror, create child and cast it
-            self._generate_child_ray(
-                nearest_intersection_geometry.get_reflected_direction(self)
-            )
-            self._child_ray.cast_ray(world_objects)
-        elif (
-            nearest_intersection_geometry.is_refractive
-        ):  # if the ray hit a lens, create child and cast it
-            self._generate_child_ray(
-                nearest_intersection_geometry.get_refracted_direction(
-                    self, nearest_intersection_point
-                )
-            )
-            self._child_ray.cast_ray(world_objects)
+        if segment.is_reflective:  # if the ray hit a mirror, create child
+            self._generate_child_ray(segment.get_reflected_direction(self))
+        elif segment.is_refractive:  # if the ray hit a lens, create child
+            self._generate_child_ray(segment.get_refracted_direction(self, point))
         else:
             self._child_ray = None
+        return self._child_ray
+
+    def update_path_bounds(self):
+        # Records the bounding box of every generation of this ray's path and the
+        # world objects the path hits, so later geometry changes can be tested
+        # against it without re-tracing
+        path_bounds = []
+        self._path_world_objects = set()
+        ray = self
+        while ray is not None:
+            path_bounds.append(
+                numpy.concatenate(
+                    (
+                        numpy.minimum(ray._origin, ray._end),
+                        numpy.maximum(ray._origin, ray._end),
+                    )
+                )
+            )
+            if ray._hit_world_object is not None:
+                self._path_world_objects.add(ray._hit_world_object)
+            ray = ray._child_ray
+        self._path_bounds = numpy.array(path_bounds)
+
+    def is_path_affected(self, world_objects: set, regions: numpy.ndarray) -> bool:
+        # regions is a (K, 4) array of bounding boxes that changed
+        if not self._path_world_objects.isdisjoint(world_objects):
+            return True
+        return bool(
+            numpy.any(
+                (self._path_bounds[:, None, 0] <= regions[None, :, 2])
+                & (regions[None, :, 0] <= self._path_bounds[:, None, 2])
+                & (self._path_bounds[:, None, 1] <= regions[None, :, 3])
+                & (regions[None, :, 1] <= self._path_bounds[:, None, 3])
+            )
+        )
 
     def _generate_child_ray(self, direction):
         if self._child_ray is None:
@@ -88,3 +123,26 @@ class LightRay:
         )
         if self._child_ray is not None:
             self._child_ray.draw()
+
+
+def cast_rays(light_rays: list, engine):
+    # Advances every live ray one generation at a time as a wavefront: each
+    # generation is resolved with one batched engine query, and the child rays
+    # of reflective/refractive hits form the next generation
+    active_rays = light_rays
+    while len(active_rays) > 0:
+        indices, points = engine.get_nearest_intersections(
+            numpy.array([ray._origin for ray in active_rays]),
+            numpy.array([ray._direction for ray in active_rays]),
+        )
+        next_rays = []
+        for ray, index, point in zip(active_rays, indices, points):
+            if index < 0:
+                child_ray = ray._apply_intersection(None, None, None)
+            else:
+                child_ray = ray._apply_intersection(
+                    engine.get_world_object(index), engine.get_segment(index), point
+                )
+            if child_ray is not None:
+                next_rays.append(child_ray)
+        active_rays = next_rays
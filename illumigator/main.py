@@ -1,6 +1,6 @@
 import arcade
 
-from illumigator import entity, level, menus, util
+from illumigator import entity, level_loader, menus, util
 from util import WORLD_WIDTH, WORLD_HEIGHT, WINDOW_TITLE
 from level_selector import LevelSelector
 
@@ -8,7 +8,7 @@ from level_selector import LevelSelector
 class GameObject(arcade.Window):
     def __init__(self):
         super().__init__(WORLD_WIDTH, WORLD_HEIGHT, WINDOW_TITLE, resizable=True)
-        self.enemy = None
+        self.enemies = None
         self.character = None
         self.current_level = None
         self.menu_sound = None
@@ -41,6 +41,11 @@ class GameObject(arcade.Window):
         self.music_volume = self.settings["volume"]["music"] * self.master_volume
         self.effects_volume = self.settings["volume"]["effects"] * self.master_volume
 
+        # ========================= Level Loading =========================
+        # The level is prepared in the background while the window opens
+        self.level_loader = level_loader.LevelLoader()
+        self.level_loader.preload(self.current_level_id)
+
     def setup(self):
         self.game_state = "menu"
         self.background_sprite = util.load_sprite(
@@ -51,9 +56,18 @@ class GameObject(arcade.Window):
         )
         self.background_sprite.alpha = 100
         self.character = entity.Character(walking_volume=self.effects_volume)
-        self.enemy = entity.Enemy()
 
-        self.current_level = level.load_level(util.load_data(self.current_level_id, True))
+        # Kept so restarting the level doesn't read the file again
+        self.current_level_data, self.current_level = self.level_loader.load(
+            self.current_level_id
+        )
+        # Levels may place any number of enemies, by default there is one
+        self.enemies = entity.EnemyManager(
+            self.current_level_data["level_data"].get(
+                "enemy_coordinate_list",
+                [[util.WORLD_WIDTH - 200, util.WORLD_HEIGHT - 200]],
+            )
+        )
 
         # ========================= Sounds =========================
         self.menu_sound = util.load_sound("retro_blip.wav")
@@ -76,7 +90,7 @@ class GameObject(arcade.Window):
     def on_update(self, delta_time):
         if self.game_state == "game":
             self.character.update(self.current_level, self.effects_volume)
-            self.enemy.update(self.current_level, self.character)
+            self.enemies.update(self.current_level, self.character)
             self.current_level.update(
                 self.character, self.mouse_x, self.mouse_y
             )  # Pass mouse coords for debugging purposes
@@ -101,7 +115,7 @@ class GameObject(arcade.Window):
             self.background_sprite.draw()
             self.current_level.draw()
             self.character.draw()
-            self.enemy.draw()
+            self.enemies.draw()
 
             if self.music_player is None:
                 self.music_player = arcade.play_sound(self.background_music, self.music_volume, looping=True)
@@ -146,11 +160,7 @@ class GameObject(arcade.Window):
             if key == arcade.key.ENTER:
                 self.game_state = "game"
             if key == arcade.key.ESCAPE:
-                self.settings["volume"]["master"] = self.master_volume
-                self.settings["volume"]["music"] = self.music_volume
-                self.settings["volume"]["effects"] = self.effects_volume
-                util.write_data("config.json", self.settings)
-                arcade.close_window()
+                self.on_close()
 
         elif self.game_state == "game":
             if key == arcade.key.G:
@@ -276,12 +286,13 @@ class GameObject(arcade.Window):
         self.settings["volume"]["music"] = self.music_volume
         self.settings["volume"]["effects"] = self.effects_volume
         util.write_data("config.json", self.settings)
+        self.level_loader.shutdown()
         arcade.close_window()
 
     def reset_level(self):
-        self.current_level = level.load_level(util.load_data(self.current_level_id, True))
+        self.current_level.reset()
         self.character.reset_pos(util.WORLD_WIDTH // 2, util.WORLD_HEIGHT // 2)
-        self.enemy.reset_pos(util.WORLD_WIDTH - 200, util.WORLD_HEIGHT - 200)
+        self.enemies.reset()
         self.game_state = "game"
 
 
@@ -38,10 +38,6 @@ class Slider:
             self.center_x - self.slider_width // 2
         ) + self._pos * self.slider_width
 
-    def draw(self):
-        self.slider.draw()
-        self.cursor.draw()
-
     @property
     def pos(self):
         return self._pos
@@ -57,45 +53,50 @@ class Slider:
 
 
 class MainMenu:
-    @staticmethod
-    def draw():
-        arcade.draw_text(
-            "Illumi",
-            x_midpoint,
-            y_midpoint,
-            arcade.color.YELLOW,
-            util.H2_FONT_SIZE,
-            anchor_x="right",
-            font_name=util.MENU_FONT,
-        )
-        arcade.draw_text(
-            "Gator",
-            x_midpoint,
-            y_midpoint,
-            arcade.color.GREEN,
-            util.H2_FONT_SIZE,
-            anchor_x="left",
-            font_name=util.MENU_FONT,
-            bold=True,
-        )
-        arcade.draw_text(
-            "Press ENTER to start",
-            x_midpoint,
-            y_midpoint - 50,
-            arcade.color.WHITE,
-            util.BODY_FONT_SIZE,
-            anchor_x="center",
-            font_name=util.MENU_FONT,
-        )
-        arcade.draw_text(
-            "Press ESCAPE to quit",
-            x_midpoint,
-            y_midpoint - 100,
-            arcade.color.WHITE,
-            util.BODY_FONT_SIZE,
-            anchor_x="center",
-            font_name=util.MENU_FONT,
-        )
+    def __init__(self):
+        self.text_list = [
+            arcade.Text(
+                "Illumi",
+                x_midpoint,
+                y_midpoint,
+                arcade.color.YELLOW,
+                util.H2_FONT_SIZE,
+                anchor_x="right",
+                font_name=util.MENU_FONT,
+            ),
+            arcade.Text(
+                "Gator",
+                x_midpoint,
+                y_midpoint,
+                arcade.color.GREEN,
+                util.H2_FONT_SIZE,
+                anchor_x="left",
+                font_name=util.MENU_FONT,
+                bold=True,
+            ),
+            arcade.Text(
+                "Press ENTER to start",
+                x_midpoint,
+                y_midpoint - 50,
+                arcade.color.WHITE,
+                util.BODY_FONT_SIZE,
+                anchor_x="center",
+                font_name=util.MENU_FONT,
+            ),
+            arcade.Text(
+                "Press ESCAPE to quit",
+                x_midpoint,
+                y_midpoint - 100,
+                arcade.color.WHITE,
+                util.BODY_FONT_SIZE,
+                anchor_x="center",
+                font_name=util.MENU_FONT,
+            ),
+        ]
+
+    def draw(self):
+        for text in self.text_list:
+            text.draw()
 
 
 class GenericMenu:
@@ -105,19 +106,8 @@ class GenericMenu:
         self._selection = selection
         self.overlay = overlay
 
-    def draw(self):
-        dy = 0
-        if self.overlay:
-            arcade.draw_rectangle_filled(
-                x_midpoint,
-                y_midpoint,
-                util.WORLD_WIDTH // 3,
-                util.WORLD_HEIGHT // 2,
-                arcade.color.BLACK,
-            )
-        else:
-            arcade.set_background_color(arcade.color.BLACK)
-        arcade.draw_text(
+        # Text is laid out once, only the colors change with the selection
+        self.title_text = arcade.Text(
             self.title,
             x_midpoint,
             y_midpoint + util.WORLD_HEIGHT // 4,
@@ -127,30 +117,53 @@ class GenericMenu:
             anchor_y="top",
             font_name=util.MENU_FONT,
         )
-        for index, option in enumerate(self.options):
-            color = arcade.color.WHITE
-            if index == self._selection:
-                color = arcade.color.RED
-            arcade.draw_text(
+        self.option_text_list = [
+            arcade.Text(
                 option,
                 x_midpoint,
-                y_midpoint - dy,
-                color,
+                y_midpoint - index * 50,
+                arcade.color.WHITE,
                 util.H3_FONT_SIZE,
                 anchor_x="center",
                 font_name=util.MENU_FONT,
             )
-            dy += 50
+            for index, option in enumerate(self.options)
+        ]
+        self._update_selection_colors()
+
+    def draw(self):
+        if self.overlay:
+            arcade.draw_rectangle_filled(
+                x_midpoint,
+                y_midpoint,
+                util.WORLD_WIDTH // 3,
+                util.WORLD_HEIGHT // 2,
+                arcade.color.BLACK,
+            )
+        else:
+            arcade.set_background_color(arcade.color.BLACK)
+        self.title_text.draw()
+        for option_text in self.option_text_list:
+            option_text.draw()
+
+    def _update_selection_colors(self):
+        for index, option_text in enumerate(self.option_text_list):
+            if index == self._selection:
+                option_text.color = arcade.color.RED
+            else:
+                option_text.color = arcade.color.WHITE
 
     def increment_selection(self):
         self._selection = (
             0 if self._selection == len(self.options) - 1 else self._selection + 1
         )
+        self._update_selection_colors()
 
     def decrement_selection(self):
         self._selection = (
             len(self.options) - 1 if self._selection == 0 else self._selection - 1
         )
+        self._update_selection_colors()
 
     @property
     def selection(self):
@@ -161,123 +174,116 @@ class ControlsMenu:
     def __init__(self):
         self.wasd_row = ("A", "S", "D")
 
-    def draw(self):
         # ========================= Movement Key Sprites =========================
-        util.load_sprite(
-            "key.png",
-            1,
-            center_x=util.WORLD_WIDTH // 4,
-            center_y=util.WORLD_HEIGHT // 2,
-        ).draw()
-        for index in range(-1, 2):
+        self.sprite_list = arcade.SpriteList()
+        self.sprite_list.append(
             util.load_sprite(
                 "key.png",
                 1,
-                center_x=util.WORLD_WIDTH // 4 + index * 64,
-                center_y=util.WORLD_HEIGHT // 2 - 64,
-            ).draw()
-
-        util.load_sprite(
-            "arrow.png",
-            1,
-            center_x=util.WORLD_WIDTH // 4,
-            center_y=util.WORLD_HEIGHT // 2 - 164,
-        ).draw()
+                center_x=util.WORLD_WIDTH // 4,
+                center_y=util.WORLD_HEIGHT // 2,
+            )
+        )
         for index in range(-1, 2):
+            self.sprite_list.append(
+                util.load_sprite(
+                    "key.png",
+                    1,
+                    center_x=util.WORLD_WIDTH // 4 + index * 64,
+                    center_y=util.WORLD_HEIGHT // 2 - 64,
+                )
+            )
+
+        self.sprite_list.append(
             util.load_sprite(
                 "arrow.png",
                 1,
-                center_x=util.WORLD_WIDTH // 4 + index * 64,
-                center_y=util.WORLD_HEIGHT // 2 - 228,
-                angle=90 + (index + 1) * 90,
-            ).draw()
+                center_x=util.WORLD_WIDTH // 4,
+                center_y=util.WORLD_HEIGHT // 2 - 164,
+            )
+        )
+        for index in range(-1, 2):
+            self.sprite_list.append(
+                util.load_sprite(
+                    "arrow.png",
+                    1,
+                    center_x=util.WORLD_WIDTH // 4 + index * 64,
+                    center_y=util.WORLD_HEIGHT // 2 - 228,
+                    angle=90 + (index + 1) * 90,
+                )
+            )
 
         # ========================= Rotation Key Sprites =========================
-        util.load_sprite(
-            "key.png",
-            1,
-            center_x=util.WORLD_WIDTH * 3 // 4 - 32,
-            center_y=util.WORLD_HEIGHT // 2,
-        ).draw()
-        util.load_sprite(
-            "key.png",
-            1,
-            center_x=util.WORLD_WIDTH * 3 // 4 + 32,
-            center_y=util.WORLD_HEIGHT // 2,
-        ).draw()
+        for offset in (-32, 32):
+            self.sprite_list.append(
+                util.load_sprite(
+                    "key.png",
+                    1,
+                    center_x=util.WORLD_WIDTH * 3 // 4 + offset,
+                    center_y=util.WORLD_HEIGHT // 2,
+                )
+            )
 
         # ========================= Titles =========================
-        arcade.draw_text(
-            "PRESS ESCAPE TO RETURN",
-            util.WORLD_WIDTH // 2,
-            util.WORLD_HEIGHT - util.H3_FONT_SIZE,
-            font_size=util.H3_FONT_SIZE,
-            anchor_x="center",
-            anchor_y="top",
-            color=arcade.color.RED,
-            font_name=util.MENU_FONT,
-        )
-        arcade.draw_text(
-            "MOVEMENT",
-            util.WORLD_WIDTH // 4,
-            util.WORLD_HEIGHT // 2 + 100,
-            font_size=util.BODY_FONT_SIZE,
-            anchor_x="center",
-            font_name=util.MENU_FONT,
-        )
-        arcade.draw_text(
-            "ROTATION",
-            util.WORLD_WIDTH * 3 // 4,
-            util.WORLD_HEIGHT // 2 + 100,
-            font_size=util.BODY_FONT_SIZE,
-            anchor_x="center",
-            font_name=util.MENU_FONT,
-        )
-
-        # ========================= Movement Key Labels =========================
-        arcade.draw_text(
-            "W",
-            util.WORLD_WIDTH // 4,
-            util.WORLD_HEIGHT // 2,
-            font_size=util.H3_FONT_SIZE,
-            anchor_x="center",
-            anchor_y="center",
-            color=arcade.color.BLACK_OLIVE,
-            font_name=util.MENU_FONT,
-        )
-        for index in range(-1, 2):
-            arcade.draw_text(
-                self.wasd_row[index + 1],
-                util.WORLD_WIDTH // 4 + index * 64,
-                util.WORLD_HEIGHT // 2 - 64,
+        self.text_list = [
+            arcade.Text(
+                "PRESS ESCAPE TO RETURN",
+                util.WORLD_WIDTH // 2,
+                util.WORLD_HEIGHT - util.H3_FONT_SIZE,
                 font_size=util.H3_FONT_SIZE,
                 anchor_x="center",
-                anchor_y="center",
-                color=arcade.color.BLACK_OLIVE,
+                anchor_y="top",
+                color=arcade.color.RED,
+                font_name=util.MENU_FONT,
+            ),
+            arcade.Text(
+                "MOVEMENT",
+                util.WORLD_WIDTH // 4,
+                util.WORLD_HEIGHT // 2 + 100,
+                font_size=util.BODY_FONT_SIZE,
+                anchor_x="center",
                 font_name=util.MENU_FONT,
+            ),
+            arcade.Text(
+                "ROTATION",
+                util.WORLD_WIDTH * 3 // 4,
+                util.WORLD_HEIGHT // 2 + 100,
+                font_size=util.BODY_FONT_SIZE,
+                anchor_x="center",
+                font_name=util.MENU_FONT,
+            ),
+        ]
+
+        # ========================= Key Labels =========================
+        key_labels = [("W", util.WORLD_WIDTH // 4, util.WORLD_HEIGHT // 2)]
+        for index in range(-1, 2):
+            key_labels.append(
+                (
+                    self.wasd_row[index + 1],
+                    util.WORLD_WIDTH // 4 + index * 64,
+                    util.WORLD_HEIGHT // 2 - 64,
+                )
+            )
+        key_labels.append(("Q", util.WORLD_WIDTH * 3 // 4 - 32, util.WORLD_HEIGHT // 2))
+        key_labels.append(("E", util.WORLD_WIDTH * 3 // 4 + 32, util.WORLD_HEIGHT // 2))
+        for label, center_x, center_y in key_labels:
+            self.text_list.append(
+                arcade.Text(
+                    label,
+                    center_x,
+                    center_y,
+                    font_size=util.H3_FONT_SIZE,
+                    anchor_x="center",
+                    anchor_y="center",
+                    color=arcade.color.BLACK_OLIVE,
+                    font_name=util.MENU_FONT,
+                )
             )
 
-        # ========================= Rotation Key Labels =========================
-        arcade.draw_text(
-            "Q",
-            util.WORLD_WIDTH * 3 // 4 - 32,
-            util.WORLD_HEIGHT // 2,
-            font_size=util.H3_FONT_SIZE,
-            anchor_x="center",
-            anchor_y="center",
-            color=arcade.color.BLACK_OLIVE,
-            font_name=util.MENU_FONT,
-        )
-        arcade.draw_text(
-            "E",
-            util.WORLD_WIDTH * 3 // 4 + 32,
-            util.WORLD_HEIGHT // 2,
-            font_size=util.H3_FONT_SIZE,
-            anchor_x="center",
-            anchor_y="center",
-            color=arcade.color.BLACK_OLIVE,
-            font_name=util.MENU_FONT,
-        )
+    def draw(self):
+        self.sprite_list.draw()
+        for text in self.text_list:
+            text.draw()
 
 
 class AudioMenu:
@@ -291,33 +297,55 @@ class AudioMenu:
             self.slider_list.append(
                 Slider(util.WORLD_WIDTH // 2, int(util.WORLD_HEIGHT * 0.66 - index * 150), 2, self.volume_list[index]))
 
-    def draw(self):
-        arcade.draw_text("PRESS ESCAPE TO RETURN",
-                         util.WORLD_WIDTH // 2,
-                         util.WORLD_HEIGHT - util.H3_FONT_SIZE,
-                         font_size=util.H3_FONT_SIZE,
-                         anchor_x="center",
-                         anchor_y="top",
-                         color=arcade.color.RED,
-                         font_name=util.MENU_FONT
-                         )
-
-        for index in range(0, len(self.label_list)):
-            arcade.draw_text(self.label_list[index] + ": " + str(int(self.slider_list[index].pos * 100)),
-                             self.slider_list[index].center_x,
-                             self.slider_list[index].center_y + 50,
-                             font_size=util.H3_FONT_SIZE,
-                             color=arcade.color.BLUE,
-                             anchor_x="center",
-                             font_name=util.MENU_FONT
-                             )
+        # All sliders are drawn from one sprite list the menu owns, labels are only
+        # re-laid out when the volume they show changes
+        self.sprite_list = arcade.SpriteList()
+        for slider in self.slider_list:
+            self.sprite_list.append(slider.slider)
+            self.sprite_list.append(slider.cursor)
+        self.title_text = arcade.Text(
+            "PRESS ESCAPE TO RETURN",
+            util.WORLD_WIDTH // 2,
+            util.WORLD_HEIGHT - util.H3_FONT_SIZE,
+            font_size=util.H3_FONT_SIZE,
+            anchor_x="center",
+            anchor_y="top",
+            color=arcade.color.RED,
+            font_name=util.MENU_FONT,
+        )
+        self.label_text_list = [
+            arcade.Text(
+                self._get_label(index),
+                slider.center_x,
+                slider.center_y + 50,
+                font_size=util.H3_FONT_SIZE,
+                color=arcade.color.BLUE,
+                anchor_x="center",
+                font_name=util.MENU_FONT,
+            )
+            for index, slider in enumerate(self.slider_list)
+        ]
+        self._update_selection_colors()
+
+    def _get_label(self, index: int) -> str:
+        volume = int(self.slider_list[index].pos * 100)
+        return self.label_list[index] + ": " + str(volume)
 
+    def _update_selection_colors(self):
         for index, slider in enumerate(self.slider_list):
             if index == self._selection:
                 slider.slider.color = arcade.color.RED
             else:
                 slider.slider.color = arcade.color.WHITE
-            slider.draw()
+
+    def draw(self):
+        self.title_text.draw()
+        for index, label_text in enumerate(self.label_text_list):
+            label = self._get_label(index)
+            if label_text.text != label:
+                label_text.text = label
+            label_text.draw()
+        self.sprite_list.draw()
 
     def update(self):
         for slider in self.slider_list:
@@ -327,11 +355,13 @@ class AudioMenu:
         self._selection = (
             0 if self._selection == len(self.slider_list) - 1 else self._selection + 1
         )
+        self._update_selection_colors()
 
     def decrement_selection(self):
         self._selection = (
             len(self.slider_list) - 1 if self._selection == 0 else self._selection - 1
         )
+        self._update_selection_colors()
 
     @property
     def selection(self):
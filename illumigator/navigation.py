@@ -0,0 +1,273 @@
+import math
+import numpy
+
+from illumigator import collision, util
+
+# Neighbour offsets (column, row), diagonals last so straight moves win ties
+NEIGHBOR_OFFSETS = (
+    (1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)
+)
+
+
+class NavigationGrid:
+    """
+    Grid over the world marking the cells an agent can't stand in the middle of,
+    with a flow field that gives every free cell the next cell on a shortest path
+    to a target. Cells are smaller than agents, so a gap is only free when the agent
+    fits through it.
+    The flow field is only recomputed when the target changes cells or geometry
+    moving across a cell changes which cells are blocked, so any number of agents
+    can follow it with a lookup each.
+    """
+
+    def __init__(
+        self,
+        level,
+        cell_size: float = util.NAVIGATION_CELL_SIZE,
+        blocked: numpy.ndarray = None,
+        agent_size: float = util.NAVIGATION_AGENT_SIZE,
+    ):
+        self._level = level
+        self._cell_size = cell_size
+        self._agent_half_size = 0.5 * agent_size
+        self._num_columns = math.ceil(util.WORLD_WIDTH / cell_size)
+        self._num_rows = math.ceil(util.WORLD_HEIGHT / cell_size)
+        self._blocked = numpy.zeros((self._num_rows, self._num_columns), dtype=bool)
+        self._target_cell = None
+        self._distances = None
+        self._next_cell_centers = None
+        # blocked is get_blocked of an earlier grid over the same level
+        if blocked is not None:
+            self._blocked[:] = blocked
+        else:
+            self._update_blocked(
+                numpy.array([[0, 0, util.WORLD_WIDTH, util.WORLD_HEIGHT]])
+            )
+
+    def update_regions(self, bounding_boxes: numpy.ndarray):
+        # Called when geometry inside any of the (N,4) bounding_boxes moved
+        if self._update_blocked(bounding_boxes):
+            self._target_cell = None
+
+    def _update_blocked(self, bounding_boxes: numpy.ndarray) -> bool:
+        # Re-tests the cells an agent overlapping any of the (N,4) bounding_boxes
+        # could stand in, returns whether any changed
+        agent_margin = numpy.array([-1, -1, 1, 1]) * self._agent_half_size
+        bounding_boxes = bounding_boxes + agent_margin
+        min_columns, min_rows = self._get_cells(bounding_boxes[:, :2])
+        max_columns, max_rows = self._get_cells(bounding_boxes[:, 2:])
+        min_column, min_row = numpy.min(min_columns), numpy.min(min_rows)
+        max_column, max_row = numpy.max(max_columns), numpy.max(max_rows)
+        # Cells of the enclosing region that are inside one of the boxes, the
+        # rest of the region keeps its state
+        is_stale = numpy.zeros(
+            (max_row - min_row + 1, max_column - min_column + 1), dtype=bool
+        )
+        for box_cells in zip(min_columns, min_rows, max_columns, max_rows):
+            is_stale[
+                box_cells[1] - min_row : box_cells[3] - min_row + 1,
+                box_cells[0] - min_column : box_cells[2] - min_column + 1,
+            ] = True
+        regions = (
+            numpy.column_stack((min_columns, min_rows, max_columns + 1, max_rows + 1))
+            * self._cell_size
+            + agent_margin
+        )
+
+        blocked = numpy.zeros(
+            (max_row - min_row + 1, max_column - min_column + 1), dtype=bool
+        )
+        world_objects = list(
+            {
+                world_object
+                for region in regions
+                for world_object in self._level.collision_index.query(region)
+            }
+        )
+        if len(world_objects) > 0:
+            # Pair every object with the cells of the region its bounds overlap,
+            # then test all pairs at once
+            object_bounds = (
+                numpy.array(
+                    [
+                        self._level.collision_index.get_bounds(world_object)
+                        for world_object in world_objects
+                    ]
+                )
+                + agent_margin
+            )
+            min_cells = numpy.clip(
+                (object_bounds[:, :2] // self._cell_size).astype(int),
+                [min_column, min_row],
+                [max_column, max_row],
+            )
+            max_cells = numpy.clip(
+                (object_bounds[:, 2:] // self._cell_size).astype(int),
+                [min_column, min_row],
+                [max_column, max_row],
+            )
+            spans = max_cells - min_cells + 1
+            counts = spans[:, 0] * spans[:, 1]
+            pair_objects = numpy.repeat(numpy.arange(len(world_objects)), counts)
+            pair_offsets = numpy.arange(numpy.sum(counts)) - numpy.repeat(
+                numpy.cumsum(counts) - counts, counts
+            )
+            pair_columns = (
+                min_cells[pair_objects, 0] + pair_offsets % spans[pair_objects, 0]
+            )
+            pair_rows = (
+                min_cells[pair_objects, 1] + pair_offsets // spans[pair_objects, 0]
+            )
+            is_pair_stale = is_stale[pair_rows - min_row, pair_columns - min_column]
+            pair_objects = pair_objects[is_pair_stale]
+            pair_columns = pair_columns[is_pair_stale]
+            pair_rows = pair_rows[is_pair_stale]
+
+            oriented_bounding_boxes = [
+                world_object.get_oriented_bounding_box()
+                for world_object in world_objects
+            ]
+            rotation_angles = numpy.array([box[1] for box in oriented_bounding_boxes])
+            is_pair_blocked = collision.get_swept_box_collisions(
+                (numpy.column_stack((pair_columns, pair_rows)) + 0.5)
+                * self._cell_size,
+                # An agent in the middle of the cell, which like a moving agent
+                # collides with objects it only touches
+                numpy.full(2, self._agent_half_size),
+                numpy.zeros(2),
+                numpy.array([box[0] for box in oriented_bounding_boxes])[pair_objects],
+                numpy.column_stack(
+                    (numpy.cos(rotation_angles), numpy.sin(rotation_angles))
+                )[pair_objects],
+                numpy.array([box[2] for box in oriented_bounding_boxes])[pair_objects],
+            )
+            blocked[
+                pair_rows[is_pair_blocked] - min_row,
+                pair_columns[is_pair_blocked] - min_column,
+            ] = True
+
+        region_slice = numpy.s_[min_row : max_row + 1, min_column : max_column + 1]
+        if numpy.array_equal(self._blocked[region_slice][is_stale], blocked[is_stale]):
+            return False
+        self._blocked[region_slice][is_stale] = blocked[is_stale]
+        return True
+
+    def _get_cell(self, position: numpy.ndarray) -> tuple:
+        # (column, row), positions outside the world are clamped into the border
+        return (
+            min(max(int(position[0] // self._cell_size), 0), self._num_columns - 1),
+            min(max(int(position[1] // self._cell_size), 0), self._num_rows - 1),
+        )
+
+    def _get_cells(self, positions: numpy.ndarray) -> tuple:
+        # _get_cell for (N,2) positions, returns (columns, rows) arrays
+        columns = numpy.clip(
+            (positions[:, 0] // self._cell_size).astype(int), 0, self._num_columns - 1
+        )
+        rows = numpy.clip(
+            (positions[:, 1] // self._cell_size).astype(int), 0, self._num_rows - 1
+        )
+        return columns, rows
+
+    def set_target(self, target: numpy.ndarray):
+        target_cell = self._get_cell(target)
+        if target_cell != self._target_cell:
+            self._target_cell = target_cell
+            self._compute_flow_field()
+
+    def _compute_flow_field(self):
+        # Breadth first search outwards from the target, advancing the whole
+        # frontier one step at a time over the grid
+        padded_blocked = numpy.pad(self._blocked, 1, constant_values=True)
+
+        def shift(padded: numpy.ndarray, d_column: int, d_row: int) -> numpy.ndarray:
+            return padded[
+                1 + d_row : 1 + d_row + self._num_rows,
+                1 + d_column : 1 + d_column + self._num_columns,
+            ]
+
+        # For each offset, the cells that can be stepped into along it. Diagonal
+        # steps can't cut the corner of a blocked cell
+        can_enter = []
+        for d_column, d_row in NEIGHBOR_OFFSETS:
+            is_free = ~self._blocked
+            if d_column != 0 and d_row != 0:
+                is_free = (
+                    is_free
+                    & ~shift(padded_blocked, -d_column, 0)
+                    & ~shift(padded_blocked, 0, -d_row)
+                )
+            can_enter.append(is_free)
+
+        target_column, target_row = self._target_cell
+        distances = numpy.full((self._num_rows, self._num_columns), numpy.inf)
+        distances[target_row, target_column] = 0
+        is_unvisited = numpy.isinf(distances)
+        padded_frontier = numpy.zeros_like(padded_blocked)
+        padded_frontier[1 + target_row, 1 + target_column] = True
+        distance = 0
+        while True:
+            distance += 1
+            frontier = numpy.zeros_like(self._blocked)
+            for (d_column, d_row), is_free in zip(NEIGHBOR_OFFSETS, can_enter):
+                frontier |= shift(padded_frontier, -d_column, -d_row) & is_free
+            frontier &= is_unvisited
+            if not numpy.any(frontier):
+                break
+            distances[frontier] = distance
+            is_unvisited &= ~frontier
+            padded_frontier[1:-1, 1:-1] = frontier
+        self._distances = distances
+
+        # Each cell points at its neighbour closest to the target, found for all
+        # cells at once by comparing the distance grid shifted each way. Blocked
+        # cells still point out of themselves so agents pushed into one recover
+        padded_distances = numpy.pad(distances, 1, constant_values=numpy.inf)
+        neighbor_distances = []
+        for d_column, d_row in NEIGHBOR_OFFSETS:
+            neighbor_distance = shift(padded_distances, d_column, d_row)
+            if d_column != 0 and d_row != 0:
+                neighbor_distance = numpy.where(
+                    shift(padded_blocked, d_column, 0)
+                    | shift(padded_blocked, 0, d_row),
+                    numpy.inf,
+                    neighbor_distance,
+                )
+            neighbor_distances.append(neighbor_distance)
+        neighbor_distances = numpy.stack(neighbor_distances)
+        best_neighbor = numpy.argmin(neighbor_distances, axis=0)
+        offsets = numpy.array(NEIGHBOR_OFFSETS)[best_neighbor]
+        columns, rows = numpy.meshgrid(
+            numpy.arange(self._num_columns), numpy.arange(self._num_rows)
+        )
+        self._next_cell_centers = (
+            numpy.stack((columns, rows), axis=2) + offsets + 0.5
+        ) * self._cell_size
+        # Cells that can't reach the target, or are the target, have no next cell
+        no_next_cell = numpy.min(neighbor_distances, axis=0) >= distances
+        self._next_cell_centers[no_next_cell] = numpy.nan
+
+    def get_directions(self, positions: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns the unit directions from the (N,2) positions towards the next cell
+        on the way to the target, or zeros for positions in the target's cell or
+        that can't reach it. set_target must have been called first.
+        """
+        columns, rows = self._get_cells(positions)
+        directions = self._next_cell_centers[rows, columns] - positions
+        direction_mags = numpy.linalg.norm(directions, axis=1)
+        has_direction = direction_mags > 0  # False for nan too
+        directions[has_direction] /= direction_mags[has_direction, None]
+        directions[~has_direction] = 0
+        return directions
+
+    def get_cell_centers(self, positions: numpy.ndarray) -> numpy.ndarray:
+        columns, rows = self._get_cells(positions)
+        return (numpy.column_stack((columns, rows)) + 0.5) * self._cell_size
+
+    def get_blocked(self) -> numpy.ndarray:
+        return self._blocked.copy()
+
+    def is_blocked(self, position: numpy.ndarray) -> bool:
+        column, row = self._get_cell(position)
+        return bool(self._blocked[row, column])
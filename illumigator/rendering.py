@@ -0,0 +1,38 @@
+import arcade
+
+
+class LineBatch:
+    """
+    Retained set of shapes drawn with a single call. Shapes are grouped by key so
+    one group can be replaced without recomputing the others, but any change
+    uploads the whole batch again on the next draw. Shapes that change often belong
+    in a batch apart from those that never do.
+    """
+
+    def __init__(self, line_width: float = 1):
+        self._line_width = line_width
+        self._shape_list = arcade.ShapeElementList()
+        self._shapes = {}
+
+    def set_lines(self, key, point_list: list, color):
+        # point_list holds pairs of points, each pair is one line
+        if len(point_list) == 0:
+            self.remove_lines(key)
+            return
+        self.set_shapes(key, [arcade.create_lines(point_list, color, self._line_width)])
+
+    def set_shapes(self, key, shapes: list):
+        self.remove_lines(key)
+        if len(shapes) == 0:
+            return
+        self._shapes[key] = shapes
+        for shape in shapes:
+            self._shape_list.append(shape)
+
+    def remove_lines(self, key):
+        for shape in self._shapes.pop(key, ()):
+            self._shape_list.remove(shape)
+
+    def draw(self):
+        if len(self._shapes) > 0:
+            self._shape_list.draw()
@@ -6,6 +6,8 @@ import numpy
 import math
 
 import json
+import re
+import threading
 
 # ========================= Game Constants =========================
 # Window
@@ -13,15 +15,22 @@ WORLD_WIDTH: int = 1280  # Width of the game for calculating coordinates and pos
 WORLD_HEIGHT: int = 720  # Height of the game
 WINDOW_TITLE: str = "IllumiGator"
 
+# Headless (no window, sprites or textures), set ILLUMIGATOR_HEADLESS=1 before import
+HEADLESS: bool = os.environ.get("ILLUMIGATOR_HEADLESS", "0") not in ("", "0")
+
 # Monitor
-for m in get_monitors():
-    if m.is_primary:
-        SCREEN_WIDTH = m.width
-        SCREEN_HEIGHT = m.height
+SCREEN_WIDTH = WORLD_WIDTH
+SCREEN_HEIGHT = WORLD_HEIGHT
+if not HEADLESS:
+    for m in get_monitors():
+        if m.is_primary:
+            SCREEN_WIDTH = m.width
+            SCREEN_HEIGHT = m.height
 
 # Debug
 DEBUG_GEOMETRY: bool = True  # Toggle with G
 DEBUG_LIGHT_SOURCES: bool = False  # Toggle with L
+DEBUG_ARC_SEGMENTS: int = 64  # Tessellation of arcs in the debug geometry overlay
 
 # ========================= Asset Constants =========================
 # World Objects
@@ -40,6 +49,11 @@ ENVIRON_ASSETS_PATH = os.path.join(os.path.split(__file__)[0], "assets/")
 VENV_ASSETS_PATH = "./venv/Lib/site-packages/illumigator/assets/"
 ENVIRON_DATA_PATH = os.path.join(os.path.split(__file__)[0], "data/")
 VENV_DATA_PATH = "./venv/Lib/site-packages/illumigator/data/"
+CACHE_PATH = os.path.join(ENVIRON_DATA_PATH, "cache/")  # Compiled levels
+
+# Community Levels
+LEVEL_NAME_PATTERN = re.compile(r'"level_name"\s*:\s*("(?:[^"\\]|\\.)*")')
+LEVEL_NAME_READ_SIZE = 4096
 
 # Fonts
 MENU_FONT = "Press Start 2P"
@@ -60,6 +74,19 @@ MAX_RAY_DISTANCE = math.sqrt(
 MAX_GENERATIONS: int = 50
 INDEX_OF_REFRACTION: float = 2
 
+# Ray Broadphase Constants
+RAY_BROADPHASE: Union[str, None] = "grid"  # "grid", "bvh" or None to test every segment
+BROADPHASE_MIN_SEGMENTS: int = 200  # Smaller levels are faster without a broadphase
+GRID_CELL_SIZE: float = 80
+BVH_LEAF_SIZE: int = 4
+
+# Collision Constants
+COLLISION_CELL_SIZE: float = 120
+
+# Navigation Constants
+NAVIGATION_AGENT_SIZE: float = 48  # Width of the enemies following the flow field
+NAVIGATION_CELL_SIZE: float = WALL_SIZE / 2  # Small enough to find gaps agents fit
+
 # Light Source Constants
 NUM_LIGHT_RAYS: int = 15
 
@@ -75,6 +102,9 @@ OBJECT_ROTATION_AMOUNT: float = 0.004
 
 # Enemy Constants
 ENEMY_MOVEMENT_SPEED = 5
+ENEMY_WAKE_DISTANCE = 300
+ENEMY_LOD_DISTANCE = 600  # Enemies farther from the player update less often
+ENEMY_LOD_INTERVAL: int = 4  # Frames between updates of far or sleeping enemies
 
 
 # ========================= Physics Functions =========================
@@ -101,82 +131,153 @@ def two_d_cross_product(vector1: numpy.ndarray, vector2: numpy.ndarray):
 
 
 # ========================= File Handling Functions =========================
-def load_sprite(
-        filename: Union[str, None] = None,
-        scale: float = 1,
+class AssetRegistry:
+    """
+    Process-wide cache of assets. Each filename is resolved to a path once, each
+    texture is loaded once per set of load arguments and shared by every sprite
+    using it, which also shares the hit box arcade computes and stores on the
+    texture. Sounds are loaded once per filename. Assets may be loaded from any
+    thread.
+    """
+
+    def __init__(self):
+        self._paths = {}
+        self._textures = {}
+        self._sounds = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_path(self, filename: str) -> str:
+        if filename not in self._paths:
+            if os.path.exists(ENVIRON_ASSETS_PATH + filename):
+                self._paths[filename] = ENVIRON_ASSETS_PATH + filename
+            else:
+                self._paths[filename] = VENV_ASSETS_PATH + filename
+        return self._paths[filename]
+
+    def get_texture(
+        self,
+        filename: str,
         image_x: float = 0,
         image_y: float = 0,
         image_width: float = 0,
         image_height: float = 0,
-        center_x: float = 0,
-        center_y: float = 0,
-        repeat_count_x: int = 1,
-        repeat_count_y: int = 1,
         flipped_horizontally: bool = False,
         flipped_vertically: bool = False,
         flipped_diagonally: bool = False,
         hit_box_algorithm: Union[str, None] = "Simple",
         hit_box_detail: float = 4.5,
-        texture: Union[arcade.Texture, None] = None,
-        angle: float = 0,
-) -> arcade.Sprite:
-    try:
-        return arcade.Sprite(
-            ENVIRON_ASSETS_PATH + filename,
-            scale,
+    ) -> arcade.Texture:
+        key = (
+            filename,
             image_x,
             image_y,
             image_width,
             image_height,
-            center_x,
-            center_y,
-            repeat_count_x,
-            repeat_count_y,
             flipped_horizontally,
             flipped_vertically,
             flipped_diagonally,
             hit_box_algorithm,
             hit_box_detail,
-            texture,
-            angle,
         )
-    except FileNotFoundError:
-        return arcade.Sprite(
-            VENV_ASSETS_PATH + filename,
-            scale,
+        # A thread asking for an asset another thread is loading waits for it
+        # instead of loading it again
+        with self._lock:
+            if key in self._textures:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._textures[key] = arcade.load_texture(
+                    self.get_path(filename),
+                    image_x,
+                    image_y,
+                    image_width,
+                    image_height,
+                    flipped_horizontally,
+                    flipped_vertically,
+                    flipped_diagonally,
+                    hit_box_algorithm=hit_box_algorithm,
+                    hit_box_detail=hit_box_detail,
+                )
+            return self._textures[key]
+
+    def get_sound(self, filename: str) -> arcade.Sound:
+        with self._lock:
+            if filename in self._sounds:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._sounds[filename] = arcade.load_sound(self.get_path(filename))
+            return self._sounds[filename]
+
+    def get_stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "textures": len(self._textures),
+            "sounds": len(self._sounds),
+        }
+
+
+ASSETS = AssetRegistry()
+
+
+def load_sprite(
+        filename: Union[str, None] = None,
+        scale: float = 1,
+        image_x: float = 0,
+        image_y: float = 0,
+        image_width: float = 0,
+        image_height: float = 0,
+        center_x: float = 0,
+        center_y: float = 0,
+        repeat_count_x: int = 1,
+        repeat_count_y: int = 1,
+        flipped_horizontally: bool = False,
+        flipped_vertically: bool = False,
+        flipped_diagonally: bool = False,
+        hit_box_algorithm: Union[str, None] = "Simple",
+        hit_box_detail: float = 4.5,
+        texture: Union[arcade.Texture, None] = None,
+        angle: float = 0,
+) -> arcade.Sprite:
+    # Sprites are always built from a shared texture, the file is only read once
+    if texture is None and filename is not None:
+        texture = ASSETS.get_texture(
+            filename,
             image_x,
             image_y,
             image_width,
             image_height,
-            center_x,
-            center_y,
-            repeat_count_x,
-            repeat_count_y,
             flipped_horizontally,
             flipped_vertically,
             flipped_diagonally,
             hit_box_algorithm,
             hit_box_detail,
-            texture,
-            angle,
         )
+    return arcade.Sprite(
+        scale=scale,
+        center_x=center_x,
+        center_y=center_y,
+        repeat_count_x=repeat_count_x,
+        repeat_count_y=repeat_count_y,
+        hit_box_algorithm=hit_box_algorithm,
+        hit_box_detail=hit_box_detail,
+        texture=texture,
+        angle=angle,
+    )
 
 
 def load_sound(filename: str) -> arcade.Sound:
-    try:
-        return arcade.load_sound(ENVIRON_ASSETS_PATH + filename)
-    except FileNotFoundError:
-        return arcade.load_sound(VENV_ASSETS_PATH + filename)
+    return ASSETS.get_sound(filename)
 
 
 def load_texture(filename: str) -> arcade.Texture:
-    try:
-        return arcade.load_texture(ENVIRON_ASSETS_PATH + filename)
-    except FileNotFoundError:
-        return arcade.load_texture(VENV_ASSETS_PATH + filename)
+    return ASSETS.get_texture(filename)
 
 
-def load_data(filename: str, is_level=False, is_system_level=True) -> dict:
+def get_data_path(filename: str, is_level=False, is_system_level=True) -> str:
     if is_level and is_system_level:
         addon_path = "levels/system/level_"
     elif is_level and not is_system_level:
@@ -184,14 +285,16 @@ def load_data(filename: str, is_level=False, is_system_level=True) -> dict:
     else:
         addon_path = ""
 
-    try:
-        file = open(ENVIRON_DATA_PATH + addon_path + filename)
-        print(ENVIRON_DATA_PATH + addon_path + filename)
-    except FileNotFoundError:
-        file = open(VENV_DATA_PATH + addon_path + filename)
+    if os.path.exists(ENVIRON_DATA_PATH + addon_path + filename):
+        return ENVIRON_DATA_PATH + addon_path + filename
+    return VENV_DATA_PATH + addon_path + filename
+
 
-    obj = json.load(file)
-    file.close()
+def load_data(filename: str, is_level=False, is_system_level=True) -> dict:
+    path = get_data_path(filename, is_level, is_system_level)
+    print(path)
+    with open(path) as file:
+        obj = json.load(file)
     return obj
 
 
@@ -199,51 +302,70 @@ def write_data(filename: str, obj: dict) -> None:
     json_obj = json.dumps(obj)
 
     if os.path.exists(ENVIRON_DATA_PATH):
-        with open(ENVIRON_DATA_PATH + filename, "w") as outfile:
-            outfile.write(json_obj)
+        path = ENVIRON_DATA_PATH + filename
     else:
-        with open(VENV_DATA_PATH + filename, "w") as outfile:
-            outfile.write(json_obj)
-
-
-def update_community_metadata() -> None:
-    last_modified_dict = {}
+        path = VENV_DATA_PATH + filename
+    # Replaced in one step so readers on other threads never see a partial file
+    with open(path + ".tmp", "w") as outfile:
+        outfile.write(json_obj)
+    os.replace(path + ".tmp", path)
+
+
+def get_level_name(path: str) -> str:
+    # Level files start with their name, so only the start of the file is read
+    with open(path) as file:
+        match = LEVEL_NAME_PATTERN.search(file.read(LEVEL_NAME_READ_SIZE))
+    if match is not None:
+        return json.loads(match.group(1))
+    with open(path) as file:
+        return json.load(file)["level_name"]
+
+
+def update_community_metadata() -> dict:
+    """
+    Brings levels.json up to date with the community directory and returns its
+    contents. Only levels whose modification time or size changed are read, and
+    levels.json is only written when something changed.
+    """
     addon_path = "levels/community/"
+    directory_path = ENVIRON_DATA_PATH + addon_path
+    if not os.path.exists(directory_path):
+        directory_path = VENV_DATA_PATH + addon_path
 
-    # Get file names and modification date from community directory
-    try:
-        files = os.scandir(ENVIRON_DATA_PATH + addon_path)
-    except FileNotFoundError:
-        files = os.scandir(VENV_DATA_PATH + addon_path)
-
-    for file in files:
-        if not file.name == "levels.json":
-            last_modified_dict[file.name] = os.path.getmtime(file)
-
-    # Get levels.json metadata file from community directory
     try:
-        metadata_file = open(ENVIRON_DATA_PATH + addon_path + "levels.json")
-        print(ENVIRON_DATA_PATH + addon_path + "levels.json")
-    except FileNotFoundError:
-        metadata_file = open(VENV_DATA_PATH + addon_path + "levels.json")
-
-    json_obj = json.load(metadata_file)
-    metadata_file.close()
-
-    # Add datapoint (new file) to levels.json if necessary
-    for filename in last_modified_dict:
-        if not (filename in json_obj["levels"]):
-            json_obj["levels"][filename] = {
-                "date_modified": last_modified_dict[filename],
-                "level_name": load_data(filename, True, False)["level_name"]
-            }
-
-    # Update levels.json with new data if necessary
-    for filename in last_modified_dict:
-        if last_modified_dict[filename] != json_obj["levels"][filename]["date_modified"]:
-            json_obj["levels"][filename] = {
-                "date_modified": last_modified_dict[filename],
-                "level_name": load_data(filename, True, False)["level_name"]
-            }
-
-    write_data("levels/community/levels.json", json_obj)
+        with open(directory_path + "levels.json") as metadata_file:
+            json_obj = json.load(metadata_file)
+    except (OSError, ValueError):
+        json_obj = {"levels": {}}
+    old_levels = json_obj["levels"]
+
+    new_levels = {}
+    with os.scandir(directory_path) as files:
+        for file in sorted(files, key=lambda file: file.name):
+            if file.name == "levels.json" or not file.name.endswith(".json"):
+                continue
+            stat = file.stat()
+            entry = old_levels.get(file.name)
+            if (
+                entry is None
+                or entry["date_modified"] != stat.st_mtime
+                or entry.get("size") != stat.st_size
+            ):
+                # One broken level must not keep the others out of the index
+                try:
+                    level_name = get_level_name(file.path)
+                except (OSError, ValueError, KeyError, TypeError) as error:
+                    print("Skipping community level %s: %r" % (file.name, error))
+                    continue
+                entry = {
+                    "date_modified": stat.st_mtime,
+                    "size": stat.st_size,
+                    "level_name": level_name,
+                }
+            new_levels[file.name] = entry
+
+    # Deleted levels drop out since only files still on disk are kept
+    if new_levels != old_levels:
+        json_obj["levels"] = new_levels
+        write_data(addon_path + "levels.json", json_obj)
+    return json_obj
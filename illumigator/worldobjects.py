@@ -4,7 +4,9 @@ import arcade
 import numpy
 import math
 
+from illumigator import collision
 from illumigator import light
+from illumigator import rendering
 from illumigator import util
 from illumigator import geometry
 from illumigator import object_animation
@@ -18,7 +20,7 @@ class WorldObject:
     _geometry_segments: list[geometry.Geometry]
     obj_animation: Union[object_animation.ObjectAnimation, None]
 
-    _sprite_list: arcade.SpriteList
+    _sprites: list[arcade.Sprite]
 
     def __init__(
         self,
@@ -33,8 +35,14 @@ class WorldObject:
         self._is_receiver = is_receiver
         self._geometry_segments = []
         self.obj_animation = None
+        self._move_listeners = []
+        self._half_extents = None  # Of the collision box, None if it can't collide
 
-        self._sprite_list = arcade.SpriteList()
+        # Handles to sprites drawn from the level's shared sprite lists. Sprites are
+        # created apart from the geometry by create_sprites, and never in headless
+        # mode
+        self._sprites = []
+        self._sprite_layout = None  # (sprite_info, dimensions) for create_sprites
 
     def initialize_sprites_and_geometry(
         self,
@@ -50,13 +58,29 @@ class WorldObject:
         axis1 = 0.5 * sprite_width * sprite_scale * dimensions[0] * axis1_norm
         axis2 = 0.5 * sprite_height * sprite_scale * dimensions[1] * axis2_norm
         if disable_geometry is False:
+            self._half_extents = 0.5 * sprite_scale * numpy.array(
+                [sprite_width * dimensions[0], sprite_height * dimensions[1]]
+            )
             self._geometry_segments = [
                 geometry.Line(position - axis1 - axis2, position - axis1 + axis2),
                 geometry.Line(position - axis1 + axis2, position + axis1 + axis2),
                 geometry.Line(position + axis1 + axis2, position + axis1 - axis2),
                 geometry.Line(position + axis1 - axis2, position - axis1 - axis2),
             ]
-
+        self._sprite_layout = (sprite_info, dimensions)
+
+    def create_sprites(self):
+        # Needs the GL context unlike the geometry, so levels built on another
+        # thread only create their sprites once back on the main thread
+        if util.HEADLESS or self._sprite_layout is None or len(self._sprites) > 0:
+            return
+        sprite_info, dimensions = self._sprite_layout
+        sprite_path, sprite_scale, sprite_width, sprite_height = sprite_info
+        position, rotation_angle = self._position, self._rotation_angle
+        axis1_norm = numpy.array([math.cos(rotation_angle), math.sin(rotation_angle)])
+        axis2_norm = numpy.array([-math.sin(rotation_angle), math.cos(rotation_angle)])
+        axis1 = 0.5 * sprite_width * sprite_scale * dimensions[0] * axis1_norm
+        axis2 = 0.5 * sprite_height * sprite_scale * dimensions[1] * axis2_norm
         for col in range(int(dimensions[0])):
             for row in range(int(dimensions[1])):
                 sprite_center = (position - axis1 - axis2) + sprite_scale * (
@@ -64,7 +88,7 @@ class WorldObject:
                     + (sprite_height * (row + 0.5) * axis2_norm)
                 )
 
-                self._sprite_list.append(
+                self._sprites.append(
                     util.load_sprite(
                         sprite_path,
                         sprite_scale,
@@ -77,17 +101,82 @@ class WorldObject:
                     )
                 )
 
+    def get_sprites(self) -> list[arcade.Sprite]:
+        return self._sprites
+
     def draw(self):
-        self._sprite_list.draw(pixelated=True)
-        if util.DEBUG_GEOMETRY:
-            for segment in self._geometry_segments:
-                segment.draw()
+        # Sprites and debug geometry are drawn by the level, subclasses only draw
+        # what isn't shared
+        pass
+
+    def create_geometry_shapes(self) -> list:
+        return [segment.create_shape() for segment in self._geometry_segments]
 
     def distance_squared_to_center(self, point_x, point_y):
         return util.distance_squared(self._position, numpy.array([point_x, point_y]))
 
-    def check_collision(self, sprite: arcade.Sprite):
-        return sprite.collides_with_list(self._sprite_list)
+    def get_bounding_box(self) -> numpy.ndarray:
+        if len(self._geometry_segments) == 0:
+            return numpy.concatenate((self._position, self._position))
+        bounding_boxes = numpy.array(
+            [segment.get_bounding_box() for segment in self._geometry_segments]
+        )
+        return numpy.concatenate(
+            (bounding_boxes[:, :2].min(axis=0), bounding_boxes[:, 2:].max(axis=0))
+        )
+
+    def get_oriented_bounding_box(self) -> Union[tuple, None]:
+        # (center, rotation angle, half extents) of the box characters collide with
+        if self._half_extents is None:
+            return None
+        return self._position, self._rotation_angle, self._half_extents
+
+    def get_state(self) -> tuple:
+        # Geometry arrays are replaced rather than modified when objects move, so
+        # shallow copies of the segments' attributes are enough to restore them
+        return (
+            self._position,
+            self._rotation_angle,
+            [dict(vars(segment)) for segment in self._geometry_segments],
+            [
+                (sprite.center_x, sprite.center_y, sprite.radians)
+                for sprite in self._sprites
+            ],
+        )
+
+    def set_state(self, state: tuple, notify: bool = True) -> bool:
+        # Returns whether the object moved, the move listeners are only called if
+        # it did and notify is set
+        position, rotation_angle, segment_states, sprite_states = state
+        # Moving replaces these attributes, so the object is where state left it
+        # exactly when they are the same objects. Sprites always move along
+        if (
+            position is self._position
+            and rotation_angle == self._rotation_angle
+            and all(
+                vars(segment).get(name) is value
+                for segment, segment_state in zip(
+                    self._geometry_segments, segment_states
+                )
+                for name, value in segment_state.items()
+            )
+        ):
+            return False
+        self._position = position
+        self._rotation_angle = rotation_angle
+        for segment, segment_state in zip(self._geometry_segments, segment_states):
+            segment.__dict__.update(segment_state)
+        for sprite, (center_x, center_y, radians) in zip(self._sprites, sprite_states):
+            sprite.center_x, sprite.center_y = center_x, center_y
+            sprite.radians = radians
+        if notify:
+            for listener in self._move_listeners:
+                listener(self)
+        return True
+
+    def add_move_listener(self, listener):
+        # listener(world_object) is called after the object's geometry moves
+        self._move_listeners.append(listener)
 
     def move_geometry(
         self, move_distance: numpy.ndarray = numpy.zeros(2), rotate_angle: float = 0
@@ -96,6 +185,9 @@ class WorldObject:
             segment.move(self._position, move_distance, rotate_angle=rotate_angle)
         self._position = self._position + move_distance
         self._rotation_angle = self._rotation_angle + rotate_angle
+        if rotate_angle != 0 or numpy.any(move_distance):
+            for listener in self._move_listeners:
+                listener(self)
 
     def move_if_safe(
         self,
@@ -103,30 +195,54 @@ class WorldObject:
         move_distance: numpy.ndarray = numpy.zeros(2),
         rotate_angle: float = 0,
     ) -> bool:
-        for sprite in self._sprite_list:
-            new_position = (
-                util.rotate_around_center(
-                    self._position,
-                    numpy.array([sprite.center_x, sprite.center_y]),
-                    rotate_angle,
-                )
-                + move_distance
-            )
-            sprite.radians += rotate_angle
-            sprite.center_x, sprite.center_y = new_position[0], new_position[1]
-        if self.check_collision(character.character_sprite):
-            for sprite in self._sprite_list:
-                new_position = util.rotate_around_center(
-                    self._position,
-                    numpy.array([sprite.center_x, sprite.center_y]) - move_distance,
-                    -rotate_angle,
-                )
-                sprite.radians -= rotate_angle
-                sprite.center_x, sprite.center_y = new_position[0], new_position[1]
+        # The candidate pose is tested analytically, nothing is touched unless the
+        # move is accepted. character is None when simulating headless
+        if character is not None and self.check_pose_collision(
+            character.character_sprite,
+            self._position + move_distance,
+            self._rotation_angle + rotate_angle,
+        ):
             return False
+        self.move_sprites(move_distance, rotate_angle)
         self.move_geometry(move_distance, rotate_angle)
         return True
 
+    def check_pose_collision(
+        self, sprite: arcade.Sprite, position: numpy.ndarray, rotation_angle: float
+    ) -> bool:
+        # Whether sprite would collide with this object's box at the given pose
+        if self._half_extents is None:
+            return False
+        sprite_min = numpy.array([sprite.left, sprite.bottom])
+        sprite_max = numpy.array([sprite.right, sprite.top])
+        return bool(
+            collision.get_swept_box_collisions(
+                0.5 * (sprite_min + sprite_max),
+                0.5 * (sprite_max - sprite_min),
+                numpy.zeros(2),
+                position[None],
+                numpy.array([[math.cos(rotation_angle), math.sin(rotation_angle)]]),
+                self._half_extents[None],
+            )[0]
+        )
+
+    def move_sprites(self, move_distance: numpy.ndarray, rotate_angle: float = 0):
+        # Rotates every sprite around the object's center at once, then moves it
+        if len(self._sprites) == 0:
+            return
+        centers = numpy.array(
+            [[sprite.center_x, sprite.center_y] for sprite in self._sprites]
+        )
+        cos, sin = math.cos(rotate_angle), math.sin(rotate_angle)
+        centers = (
+            (centers - self._position) @ numpy.array([[cos, sin], [-sin, cos]])
+            + self._position
+            + move_distance
+        )
+        for sprite, center in zip(self._sprites, centers):
+            sprite.radians += rotate_angle
+            sprite.center_x, sprite.center_y = center[0], center[1]
+
     def create_animation(
         self, travel: numpy.ndarray, dt: float = 0.01, angle_travel: float = 0
     ):
@@ -207,20 +323,69 @@ class LightSource(WorldObject):
             light.LightRay(numpy.zeros(2), numpy.zeros(2))
             for _ in range(util.NUM_LIGHT_RAYS)
         ]
-
-    def cast_rays(self, world_objects):
+        self._receiver_hits = {}
+        self._needs_full_trace = True
+        self._ray_batch = None  # Created on first draw, never in headless mode
+        self._ray_batch_is_stale = True
+
+    def cast_rays(self, world_objects, engine=None):
+        if engine is not None:
+            light.cast_rays(self._light_rays, engine)
+        else:
+            for ray in self._light_rays:
+                ray.cast_ray(world_objects)
+        self.on_rays_traced()
+        self.charge_receivers()
+
+    def on_rays_traced(self):
+        self.record_receiver_hits()
+        self._ray_batch_is_stale = True
+
+    def record_receiver_hits(self):
+        # Counts how many rays of the current ray trees end on each receiver
+        self._receiver_hits = {}
         for ray in self._light_rays:
-            ray.cast_ray(world_objects)
+            while ray is not None:
+                hit_world_object = ray._hit_world_object
+                if hit_world_object is not None and hit_world_object._is_receiver:
+                    self._receiver_hits[hit_world_object] = (
+                        self._receiver_hits.get(hit_world_object, 0) + 1
+                    )
+                ray = ray._child_ray
+
+    def charge_receivers(self):
+        # Charge receivers for every light ray that hits them
+        for receiver, hit_count in self._receiver_hits.items():
+            receiver.charge += hit_count * util.LIGHT_INCREMENT
 
     def move(self, move_distance: numpy.ndarray, rotate_angle: float = 0):
         super().move_geometry(move_distance, rotate_angle)
-        self._sprite_list.move(move_distance[0], move_distance[1])
+        for sprite in self._sprites:
+            sprite.center_x += move_distance[0]
+            sprite.center_y += move_distance[1]
         self.calculate_light_ray_positions()
 
+    def set_state(self, state: tuple, notify: bool = True) -> bool:
+        if not super().set_state(state, notify):
+            return False
+        self.calculate_light_ray_positions()
+        return True
+
     def draw(self):
-        for ray in self._light_rays:
-            ray.draw()
-        super().draw()
+        # All generations of all rays are drawn from one batch that is only rebuilt
+        # after the rays have been re-traced
+        if self._ray_batch is None:
+            self._ray_batch = rendering.LineBatch()
+        if self._ray_batch_is_stale:
+            point_list = []
+            for ray in self._light_rays:
+                while ray is not None:
+                    point_list.append(ray._origin)
+                    point_list.append(ray._end)
+                    ray = ray._child_ray
+            self._ray_batch.set_lines("rays", point_list, arcade.color.WHITE)
+            self._ray_batch_is_stale = False
+        self._ray_batch.draw()
 
     @abstractmethod
     def calculate_light_ray_positions(self):
@@ -288,6 +453,5 @@ class LightReceiver(WorldObject):
 
     def draw(self):
         color = min(255 * self.charge / util.RECEIVER_THRESHOLD, 255)
-        for sprite in self._sprite_list:
+        for sprite in self._sprites:
             sprite.color = (color, color, 70)
-        super().draw()
@@ -0,0 +1,4 @@
+import os
+
+# The game modules query the screen on import unless running headless
+os.environ.setdefault("ILLUMIGATOR_HEADLESS", "1")
@@ -0,0 +1,66 @@
+import math
+
+import numpy
+
+from illumigator import collision, level, level_generator, util
+
+# A square rotated by 45 degrees into a diamond reaching 20 * sqrt(2) from its
+# center along x and y
+DIAMOND = (
+    numpy.zeros((1, 2)),
+    numpy.array([[math.cos(math.pi / 4), math.sin(math.pi / 4)]]),
+    numpy.array([[20.0, 20.0]]),
+)
+
+
+def is_colliding(box_center, box_half_size, displacement, oriented_boxes) -> bool:
+    return bool(
+        collision.get_swept_box_collisions(
+            numpy.array(box_center, dtype=float),
+            numpy.array(box_half_size, dtype=float),
+            numpy.array(displacement, dtype=float),
+            *oriented_boxes,
+        )[0]
+    )
+
+
+def test_resting_overlap_collides():
+    assert is_colliding([0, 25], [10, 10], [0, 0], DIAMOND)
+    assert not is_colliding([0, 40], [10, 10], [0, 0], DIAMOND)
+
+
+def test_fast_move_through_thin_wall_collides():
+    # One wall thick, crossed in a single step that starts and ends clear of it
+    wall = (
+        numpy.array([[250.0, 0.0]]),
+        numpy.array([[1.0, 0.0]]),
+        numpy.array([[util.WALL_SIZE / 2, 200.0]]),
+    )
+    assert not is_colliding([100, 0], [24, 24], [0, 0], wall)
+    assert not is_colliding([400, 0], [24, 24], [0, 0], wall)
+    assert is_colliding([100, 0], [24, 24], [300, 0], wall)
+
+
+def test_move_past_rotated_box_corner():
+    # Both moves cross the diamond's bounding box diagonally, only the second
+    # comes within reach of its edge
+    assert not is_colliding([15, 35], [3, 3], [20, -20], DIAMOND)
+    assert is_colliding([0, 30], [3, 3], [20, -20], DIAMOND)
+
+
+def test_batched_collisions_match_single_box():
+    generated_level = level.load_level(level_generator.generate_level(0))
+    rng = numpy.random.default_rng(0)
+    centers = rng.uniform([0, 0], [util.WORLD_WIDTH, util.WORLD_HEIGHT], (500, 2))
+    bounding_boxes = numpy.concatenate((centers - 24, centers + 24), axis=1)
+    displacements = rng.uniform(-60, 60, (500, 2))
+
+    is_colliding_batched = generated_level.check_box_collisions(
+        bounding_boxes, displacements
+    )
+
+    assert list(is_colliding_batched) == [
+        generated_level.check_box_collision(bounding_box, displacement)
+        for bounding_box, displacement in zip(bounding_boxes, displacements)
+    ]
+    assert 0 < numpy.sum(is_colliding_batched) < len(bounding_boxes)
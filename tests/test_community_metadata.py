@@ -0,0 +1,40 @@
+import json
+
+from illumigator import util
+
+
+def write_level(directory, filename, level_name):
+    (directory / filename).write_text(
+        json.dumps({"level_name": level_name, "level_data": {}})
+    )
+
+
+def test_corrupt_level_is_skipped(tmp_path, monkeypatch, capsys):
+    community_path = tmp_path / "levels" / "community"
+    community_path.mkdir(parents=True)
+    monkeypatch.setattr(util, "ENVIRON_DATA_PATH", str(tmp_path) + "/")
+    write_level(community_path, "a.json", "Level A")
+    write_level(community_path, "b.json", "Level B")
+    (community_path / "corrupt.json").write_text('{"level_data": [1, 2')
+
+    metadata = util.update_community_metadata()
+
+    assert {
+        filename: entry["level_name"] for filename, entry in metadata["levels"].items()
+    } == {"a.json": "Level A", "b.json": "Level B"}
+    assert "corrupt.json" in capsys.readouterr().out
+    written = json.loads((community_path / "levels.json").read_text())
+    assert written == metadata
+
+
+def test_deleted_level_is_dropped(tmp_path, monkeypatch):
+    community_path = tmp_path / "levels" / "community"
+    community_path.mkdir(parents=True)
+    monkeypatch.setattr(util, "ENVIRON_DATA_PATH", str(tmp_path) + "/")
+    write_level(community_path, "a.json", "Level A")
+    write_level(community_path, "b.json", "Level B")
+    util.update_community_metadata()
+
+    (community_path / "b.json").unlink()
+
+    assert list(util.update_community_metadata()["levels"]) == ["a.json"]
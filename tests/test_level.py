@@ -0,0 +1,92 @@
+import numpy
+
+from illumigator import level, level_generator
+
+
+def load_generated_level() -> level.Level:
+    return level.load_level(
+        level_generator.generate_level(
+            2, num_mirrors=12, num_lenses=4, num_receivers=4, num_animated_walls=4
+        )
+    )
+
+
+def get_world_objects(loaded_level: level.Level) -> list:
+    return (
+        loaded_level.wall_list
+        + loaded_level.mirror_list
+        + loaded_level.light_sources_list
+        + loaded_level.light_receiver_list
+    )
+
+
+def get_ray_ends(loaded_level: level.Level) -> list:
+    ray_ends = []
+    for light_source in loaded_level.light_sources_list:
+        for ray in light_source._light_rays:
+            while ray is not None:
+                ray_ends.append(ray._end)
+                ray = ray._child_ray
+    return ray_ends
+
+
+def assert_levels_match(loaded_level: level.Level, expected_level: level.Level):
+    for world_object, expected_object in zip(
+        get_world_objects(loaded_level), get_world_objects(expected_level)
+    ):
+        numpy.testing.assert_array_equal(
+            world_object._position, expected_object._position
+        )
+        assert world_object._rotation_angle == expected_object._rotation_angle
+        numpy.testing.assert_allclose(
+            world_object.get_bounding_box(), expected_object.get_bounding_box()
+        )
+        if world_object in loaded_level.collision_index:
+            numpy.testing.assert_allclose(
+                loaded_level.collision_index.get_bounds(world_object),
+                expected_level.collision_index.get_bounds(expected_object),
+            )
+    for animated_wall, expected_wall in zip(
+        loaded_level.animated_wall_list, expected_level.animated_wall_list
+    ):
+        assert animated_wall.obj_animation.t == expected_wall.obj_animation.t
+        assert animated_wall.obj_animation.dt == expected_wall.obj_animation.dt
+    assert [receiver.charge for receiver in loaded_level.light_receiver_list] == [
+        receiver.charge for receiver in expected_level.light_receiver_list
+    ]
+
+    numpy.testing.assert_array_equal(
+        loaded_level.navigation_grid.get_blocked(),
+        expected_level.navigation_grid.get_blocked(),
+    )
+    target = numpy.array([300.0, 500.0])
+    positions = numpy.array([[100.0, 100.0], [900.0, 200.0], [1100.0, 600.0]])
+    loaded_level.navigation_grid.set_target(target)
+    expected_level.navigation_grid.set_target(target)
+    numpy.testing.assert_array_equal(
+        loaded_level.navigation_grid.get_directions(positions),
+        expected_level.navigation_grid.get_directions(positions),
+    )
+
+
+def test_reset_matches_fresh_level():
+    played_level = load_generated_level()
+    fresh_level = load_generated_level()
+
+    for frame in range(150):
+        if frame % 30 == 0:
+            for mirror in played_level.mirror_list:
+                mirror.move_if_safe(None, numpy.array([7.0, -3.0]), 0.4)
+        played_level.update(None, 0, 0)
+    assert any(receiver.charge > 0 for receiver in played_level.light_receiver_list)
+    played_level.reset()
+
+    assert_levels_match(played_level, fresh_level)
+    # Rays are only traced by the next update, which must see the restored geometry
+    played_level.update(None, 0, 0)
+    fresh_level.update(None, 0, 0)
+    assert_levels_match(played_level, fresh_level)
+    ray_ends = get_ray_ends(played_level)
+    fresh_ray_ends = get_ray_ends(fresh_level)
+    assert len(ray_ends) == len(fresh_ray_ends)
+    numpy.testing.assert_allclose(ray_ends, fresh_ray_ends)
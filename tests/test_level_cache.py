@@ -0,0 +1,34 @@
+import json
+
+from illumigator import level_cache, level_generator, util
+
+
+def write_level(tmp_path, monkeypatch) -> tuple:
+    monkeypatch.setattr(util, "CACHE_PATH", str(tmp_path / "cache"))
+    level_data = level_generator.generate_level(0)
+    source_path = tmp_path / "level_1.json"
+    source_path.write_text(json.dumps(level_data))
+    return level_data, str(source_path)
+
+
+def test_unchanged_level_is_read_from_cache(tmp_path, monkeypatch):
+    level_data, source_path = write_level(tmp_path, monkeypatch)
+    cache_path = level_cache.get_cache_path(source_path)
+    assert level_cache.read_compiled_arrays(cache_path, source_path) is None
+
+    level_cache.load_level(level_data, source_path)
+
+    assert level_cache.read_compiled_arrays(cache_path, source_path) is not None
+
+
+def test_changed_sprite_scale_is_a_cache_miss(tmp_path, monkeypatch):
+    level_data, source_path = write_level(tmp_path, monkeypatch)
+    cache_path = level_cache.get_cache_path(source_path)
+    level_cache.load_level(level_data, source_path)
+
+    wall_path, wall_scale, wall_width, wall_height = util.WALL_SPRITE_INFO
+    monkeypatch.setattr(
+        util, "WALL_SPRITE_INFO", (wall_path, 2 * wall_scale, wall_width, wall_height)
+    )
+
+    assert level_cache.read_compiled_arrays(cache_path, source_path) is None
@@ -0,0 +1,59 @@
+import numpy
+import pytest
+
+from illumigator import level, level_generator, light, util, worldobjects
+
+
+def get_ray_tree(ray: light.LightRay) -> list:
+    # (generation, end, hit world object) of every generation of ray
+    tree = []
+    while ray is not None:
+        tree.append((ray._generation, ray._end, ray._hit_world_object))
+        ray = ray._child_ray
+    return tree
+
+
+@pytest.mark.parametrize("ray_broadphase", [None, "grid", "bvh"])
+@pytest.mark.parametrize("seed", [1, 2, 6])
+def test_cast_rays_matches_cast_ray(monkeypatch, ray_broadphase, seed):
+    monkeypatch.setattr(util, "RAY_BROADPHASE", ray_broadphase)
+    monkeypatch.setattr(util, "BROADPHASE_MIN_SEGMENTS", 0)
+    # Lenses are the curved geometry, sources shining into mirror pairs give
+    # rays that bounce for many generations
+    generated_level = level.load_level(
+        level_generator.generate_level(
+            seed, num_walls=15, num_mirrors=12, num_mirror_pairs=2, num_lenses=12
+        )
+    )
+    engine = generated_level.intersection_engine
+    assert (engine.broadphase is None) == (ray_broadphase is None)
+    world_objects = (
+        generated_level.wall_list
+        + generated_level.mirror_list
+        + generated_level.light_receiver_list
+        + generated_level.light_sources_list
+    )
+
+    reference_hits = set()
+    for light_source in generated_level.light_sources_list:
+        reference_rays = [
+            light.LightRay(ray._origin, ray._direction)
+            for ray in light_source._light_rays
+        ]
+        for ray in reference_rays:
+            ray.cast_ray(world_objects)
+        light.cast_rays(light_source._light_rays, engine)
+
+        for ray, reference_ray in zip(light_source._light_rays, reference_rays):
+            tree = get_ray_tree(ray)
+            reference_tree = get_ray_tree(reference_ray)
+            assert [generation for generation, _, _ in tree] == [
+                generation for generation, _, _ in reference_tree
+            ]
+            reference_hits.update(type(hit) for _, _, hit in reference_tree)
+            for (_, end, hit), (_, reference_end, reference_hit) in zip(
+                tree, reference_tree
+            ):
+                assert hit is reference_hit
+                numpy.testing.assert_allclose(end, reference_end, atol=1e-6)
+    assert {worldobjects.Mirror, worldobjects.Lens} <= reference_hits
@@ -0,0 +1,40 @@
+import numpy
+
+from illumigator import entity, level, util
+
+# A wall across the level at x = 620 with a gap one wall wide (40 px, narrower
+# than an enemy) at y = 320..360 and a gap two walls wide (80 px) at y = 560..640
+GAPPED_WALLS = [
+    [620, 160, 1, 8, 0],
+    [620, 460, 1, 5, 0],
+    [620, 680, 1, 2, 0],
+]
+
+
+def load_gapped_level() -> level.Level:
+    return level.Level(GAPPED_WALLS, [], [], [], [])
+
+
+def test_gap_narrower_than_agent_is_blocked():
+    navigation_grid = load_gapped_level().navigation_grid
+    assert util.NAVIGATION_AGENT_SIZE > util.WALL_SIZE
+    assert navigation_grid.is_blocked(numpy.array([620, 340]))
+    assert not navigation_grid.is_blocked(numpy.array([620, 600]))
+
+
+def test_enemy_detours_around_gap_narrower_than_it():
+    gapped_level = load_gapped_level()
+    player_position = numpy.array([900.0, 340.0])
+    enemies = entity.EnemyManager([[400, 340]])
+    enemies.states[:] = entity.EnemyManager.AGGRO
+
+    for _ in range(400):
+        enemies.update_positions(gapped_level, player_position)
+        bounding_box = numpy.concatenate(
+            (enemies.positions[0] - 23, enemies.positions[0] + 23)
+        )
+        assert not gapped_level.check_box_collision(bounding_box)
+        if numpy.linalg.norm(enemies.positions[0] - player_position) < 10:
+            break
+
+    assert numpy.linalg.norm(enemies.positions[0] - player_position) < 10
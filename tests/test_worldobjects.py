@@ -0,0 +1,61 @@
+import types
+
+import numpy
+
+from illumigator import level
+
+
+def create_character(left, bottom, right, top):
+    # move_if_safe only reads the bounds of the character's sprite
+    return types.SimpleNamespace(
+        character_sprite=types.SimpleNamespace(
+            left=left, bottom=bottom, right=right, top=top
+        )
+    )
+
+
+def load_mirror_level() -> level.Level:
+    # An upright mirror about 12 px wide and 62 px tall, lit from the left
+    return level.Level([], [[640, 360, 0]], [], [[200, 360, 0]], [])
+
+
+def test_rejected_move_changes_nothing():
+    mirror_level = load_mirror_level()
+    mirror = mirror_level.mirror_list[0]
+    mirror_level.update(None, 0, 0)
+    # Clear of the mirror now, but not once it is turned on its side
+    character = create_character(650, 340, 690, 380)
+    position = mirror._position
+    segment_points = [
+        (segment._point1, segment._point2) for segment in mirror._geometry_segments
+    ]
+    collision_bounds = mirror_level.collision_index.get_bounds(mirror)
+    navigation_blocked = mirror_level.navigation_grid.get_blocked()
+
+    assert not mirror.move_if_safe(character, rotate_angle=numpy.pi / 2)
+
+    assert mirror._position is position
+    assert mirror._rotation_angle == 0
+    # Moving replaces the points, so untouched segments still hold the same arrays
+    assert all(
+        segment._point1 is point1 and segment._point2 is point2
+        for segment, (point1, point2) in zip(mirror._geometry_segments, segment_points)
+    )
+    assert mirror_level.collision_index.get_bounds(mirror) is collision_bounds
+    numpy.testing.assert_array_equal(
+        mirror_level.navigation_grid.get_blocked(), navigation_blocked
+    )
+    assert len(mirror_level._moved_world_objects) == 0
+
+
+def test_safe_move_is_applied():
+    mirror_level = load_mirror_level()
+    mirror = mirror_level.mirror_list[0]
+    character = create_character(900, 340, 940, 380)
+
+    assert mirror.move_if_safe(character, rotate_angle=numpy.pi / 2)
+
+    assert mirror._rotation_angle == numpy.pi / 2
+    assert mirror in mirror_level._moved_world_objects
+    bounds = mirror_level.collision_index.get_bounds(mirror)
+    assert bounds[2] - bounds[0] > bounds[3] - bounds[1]